@@ -1,11 +1,20 @@
+import hashlib
+import os
+import time
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status, Security
 from fastapi.security import OAuth2PasswordBearer, SecurityScopes
-from sqlalchemy.orm import Session
-from app.core.database import get_db
+from sqlalchemy import inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from app.core.cache import TTLCache
+from app.core.hashing import PasswordHashPool
+from app.core.invalidation import invalidation_bus
+from app.core.database import current_user_id, get_async_db, read_session
 from app.models.models import User
 from app.core.config import settings
 
@@ -14,23 +23,73 @@ SECRET_KEY = settings.SECRET_KEY
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    # Pin min/max to the target so needs_update() flags any other cost
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
+password_hash_pool = PasswordHashPool(
+    workers=settings.PASSWORD_HASH_WORKERS or os.cpu_count() or 1,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+    retry_after=settings.PASSWORD_HASH_RETRY_AFTER_SECONDS,
+)
 oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl="/api/v1/auth/login",
     scopes={
         "users:read": "Read user information",
         "users:write": "Modify user information",
-        "users:delete": "Delete user account"
+        "users:delete": "Delete user account",
+        "users:admin": "Administer other users"
     }
 )
 
+# Column snapshots of recently resolved users, keyed by token subject (email).
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=settings.PRINCIPAL_CACHE_TTL_SECONDS,
+)
+
+# Verified token payloads keyed by sha256 of the raw token. Entries never
+# outlive the token's own exp claim.
+token_cache = TTLCache(
+    maxsize=settings.JWT_CACHE_SIZE,
+    ttl=settings.JWT_CACHE_TTL_SECONDS,
+)
+
+# Lowest token version still accepted per user id. Entries only need to live
+# as long as an access token does; anything older has expired by then.
+revoked_token_versions = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+)
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Identity resolved from an access token without loading the users row."""
+    id: int
+    email: str
+    is_premium: bool = False
+    is_active: bool = True
+    is_admin: bool = False
+    token_version: int = 0
+    scopes: Tuple[str, ...] = ()
+
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return await password_hash_pool.run(pwd_context.verify, plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+async def get_password_hash(password: str) -> str:
+    return await password_hash_pool.run(pwd_context.hash, password)
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """True when the stored hash was made with a different bcrypt cost."""
+    return pwd_context.needs_update(hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -44,44 +103,191 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
-async def get_current_user(
-    security_scopes: SecurityScopes,
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-) -> User:
+def _snapshot_user(user: User) -> dict:
+    return {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+
+
+def _user_from_snapshot(snapshot: dict) -> User:
+    # Every hit gets its own detached instance so handlers never share state;
+    # db.merge() re-attaches it when a handler needs to write.
+    user = User(**snapshot)
+    make_transient_to_detached(user)
+    return user
+
+
+def invalidate_principal(email: Optional[str]) -> None:
+    """Drop the cached principal for a user, in every worker, after its row has changed."""
+    if email:
+        invalidation_bus.publish("principal", email)
+
+
+def _credentials_exception(security_scopes: SecurityScopes) -> HTTPException:
     if security_scopes.scopes:
         authenticate_value = f'Bearer scope="{security_scopes.scope_str}"'
     else:
         authenticate_value = "Bearer"
-    
-    credentials_exception = HTTPException(
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": authenticate_value},
     )
-    
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
+
+
+def _decode_token(token: str, security_scopes: SecurityScopes) -> dict:
+    """
+    Verify the token signature and the requested scopes and return its claims.
+    """
+    credentials_exception = _credentials_exception(security_scopes)
+    cache_key = hashlib.sha256(token.encode()).digest()
+    payload = token_cache.get(cache_key)
+    if payload is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        except JWTError:
+            raise credentials_exception
+        if payload.get("sub") is None or payload.get("type") == "refresh":
             raise credentials_exception
-        token_scopes = payload.get("scopes", [])
-        for scope in security_scopes.scopes:
-            if scope not in token_scopes:
-                raise HTTPException(
-                    status_code=status.HTTP_403_FORBIDDEN,
-                    detail="Not enough permissions",
-                    headers={"WWW-Authenticate": authenticate_value},
-                )
-    except JWTError:
-        raise credentials_exception
-
-    user = db.query(User).filter(User.email == email).first()
+        if "exp" in payload:
+            token_cache.set(cache_key, payload, ttl=payload["exp"] - time.time())
+    token_scopes = payload.get("scopes", [])
+    for scope in security_scopes.scopes:
+        if scope not in token_scopes:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Not enough permissions",
+                headers=credentials_exception.headers,
+            )
+    return payload
+
+
+def _is_revoked(payload: dict) -> bool:
+    if "ver" not in payload or "uid" not in payload:
+        return False
+    floor = revoked_token_versions.get(payload["uid"])
+    return floor is not None and payload["ver"] < floor
+
+
+async def _load_user(email: str, db: AsyncSession) -> Optional[User]:
+    snapshot = principal_cache.get(email)
+    if snapshot is None:
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
+        snapshot = _snapshot_user(user) if user is not None else None
+        # End the read transaction now instead of holding a pooled
+        # connection for the rest of the request
+        await db.rollback()
+        if snapshot is None:
+            return None
+        principal_cache.set(email, snapshot)
+    return _user_from_snapshot(snapshot)
+
+
+async def get_current_user(
+    security_scopes: SecurityScopes,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> User:
+    payload = _decode_token(token, security_scopes)
+    if _is_revoked(payload):
+        raise _credentials_exception(security_scopes)
+
+    user = await _load_user(payload["sub"], db)
     if user is None:
-        raise credentials_exception
+        raise _credentials_exception(security_scopes)
+    if "ver" in payload and payload["ver"] != (user.token_version or 0):
+        raise _credentials_exception(security_scopes)
+    current_user_id.set(user.id)
     return user
 
 
+async def get_current_principal(
+    security_scopes: SecurityScopes,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    """
+    Authenticate from the token claims alone.
+
+    Tokens issued with AUTH_CLAIMS_IN_TOKEN carry everything a Principal needs,
+    so no SQL is run. Older tokens fall back to the (cached) users lookup.
+    """
+    payload = _decode_token(token, security_scopes)
+    if _is_revoked(payload):
+        raise _credentials_exception(security_scopes)
+
+    if "uid" in payload:
+        current_user_id.set(payload["uid"])
+        return Principal(
+            id=payload["uid"],
+            email=payload["sub"],
+            is_premium=bool(payload.get("premium")),
+            is_active=bool(payload.get("active", True)),
+            is_admin=bool(payload.get("admin")),
+            token_version=payload.get("ver", 0),
+            scopes=tuple(payload.get("scopes", [])),
+        )
+
+    user = await _load_user(payload["sub"], db)
+    if user is None:
+        raise _credentials_exception(security_scopes)
+    if "ver" in payload and payload["ver"] != (user.token_version or 0):
+        raise _credentials_exception(security_scopes)
+    current_user_id.set(user.id)
+    return Principal(
+        id=user.id,
+        email=user.email,
+        is_premium=bool(user.is_premium),
+        is_active=bool(user.is_active),
+        is_admin=bool(user.is_admin),
+        token_version=user.token_version or 0,
+        scopes=tuple(payload.get("scopes", [])),
+    )
+
+
+def get_read_db(principal: Principal = Depends(get_current_principal)):
+    """Session for read-only endpoints, routed to the replica when possible."""
+    db = read_session(principal.id)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def revoke_user_tokens(user: User, db: Session) -> None:
+    """
+    Invalidate every access token issued to the user so far.
+
+    Bumps the per-user token version; tokens carrying an older version are
+    rejected by both get_current_user and get_current_principal.
+    """
+    user.token_version = (user.token_version or 0) + 1
+    db.commit()
+    mark_tokens_revoked(user.id, user.token_version)
+    invalidate_principal(user.email)
+
+
+async def revoke_user_tokens_async(user: User, db: AsyncSession) -> None:
+    """revoke_user_tokens for handlers on an AsyncSession."""
+    user.token_version = (user.token_version or 0) + 1
+    await db.commit()
+    mark_tokens_revoked(user.id, user.token_version)
+    invalidate_principal(user.email)
+
+
+def mark_tokens_revoked(user_id: int, min_version: int) -> None:
+    """Reject claims-only tokens of this user older than min_version in every worker."""
+    invalidation_bus.publish("token_version", f"{user_id}:{min_version}")
+
+
+def _apply_token_revocation(key: str) -> None:
+    user_id, min_version = key.split(":")
+    revoked_token_versions.set(int(user_id), int(min_version))
+
+
+invalidation_bus.subscribe("principal", principal_cache.invalidate)
+invalidation_bus.subscribe("token_version", _apply_token_revocation)
+
+
 async def get_current_active_user(
     current_user: User = Security(get_current_user, scopes=["users:read"])
 ) -> User:
@@ -103,13 +309,26 @@ def create_user_token(user: User, scopes: list[str] = None) -> dict:
     """
     if scopes is None:
         scopes = ["users:read", "users:write"]  # Give read and write permissions to all users
-        
+        if user.is_admin:
+            scopes.append("users:admin")
+
+    claims = {
+        "sub": user.email,
+        "scopes": scopes,
+        "ver": user.token_version or 0
+    }
+    if settings.AUTH_CLAIMS_IN_TOKEN:
+        # Enough identity for get_current_principal to skip the users query
+        claims.update({
+            "uid": user.id,
+            "premium": bool(user.is_premium),
+            "active": bool(user.is_active),
+            "admin": bool(user.is_admin),
+        })
+
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={
-            "sub": user.email,
-            "scopes": scopes
-        },
+        data=claims,
         expires_delta=access_token_expires
     )
     return {
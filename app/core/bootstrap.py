@@ -0,0 +1,213 @@
+import hashlib
+import logging
+import os
+import random
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+from sqlalchemy import create_engine, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings, BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Files the content seed reads; their fingerprint is stored in app_meta
+CONTENT_DIRS = [BASE_DIR / "app" / "data" / "questions", BASE_DIR / "app" / "data" / "situation"]
+CONTENT_FINGERPRINT_KEY = "content_fingerprint"
+
+
+def wait_for_database(engine: Engine, timeout: Optional[float] = None) -> None:
+    """Retry SELECT 1 with exponential backoff until the database answers."""
+    timeout = settings.STARTUP_DB_WAIT_SECONDS if timeout is None else timeout
+    deadline = time.monotonic() + timeout
+    delay = 0.1
+    while True:
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            return
+        except OperationalError as e:
+            if time.monotonic() >= deadline:
+                raise
+            logger.info("Database not ready (%s), retrying in %.1fs", e.orig, delay)
+            time.sleep(delay)
+            delay = min(delay * 2, 5.0) * random.uniform(0.8, 1.2)
+
+
+@contextmanager
+def advisory_lock(engine: Engine, lock_id: Optional[int] = None, blocking: bool = True):
+    """
+    Hold a database-wide lock so only one replica migrates and seeds at a
+    time. PostgreSQL and MySQL use their advisory locks; SQLite, which has
+    no such thing, uses a lock file next to the database.
+
+    Yields whether the lock was taken: with blocking=False it is not waited
+    for, and the block runs with False when another process holds it.
+    """
+    lock_id = settings.STARTUP_LOCK_ID if lock_id is None else lock_id
+    backend = engine.dialect.name
+    if backend == "sqlite":
+        database = engine.url.database
+        if not database or database == ":memory:":
+            yield True
+            return
+        import fcntl
+
+        with open(f"{database}.{lock_id}.lock", "w") as lock_file:
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+        return
+
+    if backend == "postgresql":
+        lock = "SELECT pg_advisory_lock(:id)" if blocking else "SELECT pg_try_advisory_lock(:id)"
+        unlock, params = "SELECT pg_advisory_unlock(:id)", {"id": lock_id}
+    elif backend == "mysql":
+        lock = "SELECT GET_LOCK(:id, -1)" if blocking else "SELECT GET_LOCK(:id, 0)"
+        unlock, params = "SELECT RELEASE_LOCK(:id)", {"id": str(lock_id)}
+    else:
+        yield True
+        return
+    with engine.connect() as conn:
+        taken = conn.execute(text(lock), params).scalar()
+        # Session-level locks outlive the transaction; don't sit idle in one
+        conn.commit()
+        if not blocking and not taken:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            conn.execute(text(unlock), params)
+            conn.commit()
+
+
+def alembic_config():
+    from alembic.config import Config
+
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BASE_DIR / "migrations"))
+    # Keep the application's logging setup; env.py skips fileConfig
+    config.attributes["configure_logger"] = False
+    return config
+
+
+def migration_status(engine: Engine, config) -> Tuple[set, set]:
+    """Current and head revisions, read through Alembic's API."""
+    from alembic.runtime.migration import MigrationContext
+    from alembic.script import ScriptDirectory
+
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    with engine.connect() as conn:
+        current = set(MigrationContext.configure(conn).get_current_heads())
+    return current, heads
+
+
+def content_fingerprint() -> str:
+    digest = hashlib.sha256()
+    for directory in CONTENT_DIRS:
+        if not directory.exists():
+            continue
+        for path in sorted(directory.glob("*.docx")):
+            digest.update(os.path.relpath(path, BASE_DIR).encode())
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def stored_fingerprint(engine: Engine) -> Optional[str]:
+    from app.models.models import AppMeta
+
+    with engine.connect() as conn:
+        if not inspect(conn).has_table(AppMeta.__tablename__):
+            return None
+        return conn.execute(select(AppMeta.value).where(AppMeta.key == CONTENT_FINGERPRINT_KEY)).scalar()
+
+
+def seed_content(engine: Engine, fingerprint: str) -> None:
+    from app.models.models import AppMeta
+    from app.services.question_service import QuestionService
+    from app.services.situational_service import SituationalService
+
+    with Session(engine) as db:
+        QuestionService.import_all_questions(db)
+        SituationalService.import_situational_from_files(db)
+        # Only recorded once both imports succeed, so a failed seed is retried
+        db.merge(AppMeta(key=CONTENT_FINGERPRINT_KEY, value=fingerprint))
+        db.commit()
+
+
+def upgrade_to_head(engine: Engine, config) -> None:
+    """Migrate to the head revision if behind. Call with the advisory lock held."""
+    from alembic import command
+
+    current, heads = migration_status(engine, config)
+    if current == heads:
+        return
+    with engine.begin() as conn:
+        # migrations/env.py runs on this connection instead of settings' URL
+        config.attributes["connection"] = conn
+        if not current and inspect(conn).has_table("users"):
+            # Tables made by metadata.create_all before Alembic owned the schema
+            logger.warning("Database has tables but no alembic_version; stamping it at %s", ", ".join(sorted(heads)))
+            command.stamp(config, "heads")
+        else:
+            logger.info("Migrating database from %s to %s", ", ".join(sorted(current)) or "empty", ", ".join(sorted(heads)))
+            command.upgrade(config, "heads")
+
+
+def ensure_schema(url: Optional[str] = None) -> None:
+    """
+    Migrate the database to head without seeding content. The app runs it
+    on startup, so even a bare `uvicorn app.main:app` gets a schema that
+    Alembic (and so bootstrap()) recognizes; a no-op when already at head.
+    """
+    engine = create_engine(url or settings.get_database_url(), poolclass=NullPool)
+    try:
+        config = alembic_config()
+        current, heads = migration_status(engine, config)
+        if current == heads:
+            return
+        with advisory_lock(engine):
+            upgrade_to_head(engine, config)
+    finally:
+        engine.dispose()
+
+
+def bootstrap(url: Optional[str] = None) -> None:
+    """
+    Bring the database to the migration head and seed the question content,
+    in-process. Replicas that find both up to date skip the lock entirely;
+    the rest queue on the advisory lock and re-check once they hold it.
+    """
+    url = url or settings.get_database_url()
+    engine = create_engine(url, poolclass=NullPool)
+    try:
+        start = time.perf_counter()
+        wait_for_database(engine)
+        config = alembic_config()
+        fingerprint = content_fingerprint()
+
+        current, heads = migration_status(engine, config)
+        if current == heads and stored_fingerprint(engine) == fingerprint:
+            logger.info("Database at %s and content up to date", ", ".join(sorted(heads)))
+            return
+
+        with advisory_lock(engine):
+            upgrade_to_head(engine, config)
+            if stored_fingerprint(engine) != fingerprint:
+                logger.info("Content files changed, importing questions")
+                seed_content(engine, fingerprint)
+        logger.info("Startup checks took %.0f ms", (time.perf_counter() - start) * 1000)
+    finally:
+        engine.dispose()
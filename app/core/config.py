@@ -10,6 +10,62 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "your-secret-key"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60
 
+    # Principal cache (users resolved from access tokens)
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL_SECONDS: int = 30
+    # Put user id, premium/active flags and token version into access tokens
+    # so get_current_principal can authenticate without a database query
+    AUTH_CLAIMS_IN_TOKEN: bool = False
+    # Verified JWT payloads, keyed by a digest of the raw token
+    JWT_CACHE_SIZE: int = 10000
+    JWT_CACHE_TTL_SECONDS: int = 300
+
+    # Refresh tokens: rotated on every use; used jtis land in revoked_token
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    REVOKED_TOKEN_BLOOM_CAPACITY: int = 100000
+    REVOKED_TOKEN_BLOOM_ERROR_RATE: float = 0.001
+    REVOKED_TOKEN_PURGE_INTERVAL_SECONDS: int = 3600
+
+    # Failed-login limiter; "sqlite" shares counters between workers on a host
+    LOGIN_RATE_LIMIT_BACKEND: str = "memory"
+    LOGIN_RATE_LIMIT_SQLITE_PATH: str | None = None
+    LOGIN_RATE_LIMIT_WINDOW_SECONDS: int = 900
+    LOGIN_MAX_FAILED_PER_ACCOUNT: int = 5
+    LOGIN_MAX_FAILED_PER_IP: int = 50
+
+    # Cache invalidation bus between workers: "auto" uses LISTEN/NOTIFY on
+    # PostgreSQL and a polled SQLite file otherwise; "local" disables it
+    INVALIDATION_BUS_BACKEND: str = "auto"
+    INVALIDATION_BUS_SQLITE_PATH: str | None = None
+    INVALIDATION_BUS_POLL_INTERVAL_MS: int = 200
+
+    # Star awards are logged in star_ledger; entries older than the retention
+    # window are folded into one row per user and source by a background job
+    STAR_LEDGER_RETENTION_DAYS: int = 30
+    STAR_LEDGER_COMPACT_INTERVAL_SECONDS: int = 3600
+    # Advisory lock so one worker compacts at a time; the others skip the run
+    STAR_LEDGER_COMPACT_LOCK_ID: int = 72511905
+
+    # Container start (app.scripts.startup): how long to wait for the
+    # database, and the advisory lock that lets one replica migrate and seed
+    STARTUP_DB_WAIT_SECONDS: int = 60
+    STARTUP_LOCK_ID: int = 72511904
+
+    # Warm-up after startup (pools, hot read queries); /ready reports 503
+    # until it finishes or times out
+    WARMUP_ENABLED: bool = True
+    WARMUP_TIMEOUT_SECONDS: int = 30
+
+    # Password hashing: bcrypt cost factor (log2 rounds); logins rehash
+    # stored passwords whose cost differs from this value
+    BCRYPT_ROUNDS: int = 12
+    # Password hashing pool (defaults to one worker per core)
+    PASSWORD_HASH_WORKERS: int | None = None
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    PASSWORD_HASH_RETRY_AFTER_SECONDS: int = 1
+    # Rows accepted by one POST /users/bulk; larger imports go through the CLI
+    BULK_PROVISION_MAX_ROWS: int = 2000
+
     # Chat API Configuration
     CHAT_API_URL: str | None = None
     CHAT_API_KEY: str | None = None
@@ -23,6 +79,34 @@ class Settings(BaseSettings):
     DB_HOST: str | None = None
     DB_PORT: str | None = None
     DATABASE_URL: str | None = None
+    # Optional read replica for query-only endpoints; users are pinned to the
+    # primary for READ_YOUR_WRITES_SECONDS after they commit a write
+    DATABASE_REPLICA_URL: str | None = None
+    READ_YOUR_WRITES_SECONDS: int = 5
+
+    # Connection pool (ignored for in-memory SQLite); DB_POOL_RECYCLE=-1 disables recycling
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Default per-statement time budget for requests (0 = none); routes
+    # override it with Depends(statement_budget(ms))
+    DB_STATEMENT_TIMEOUT_MS: int = 5000
+
+    # SQLite pragmas applied to every new connection (file databases only)
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456
+    # Negative values are KiB, positive values are pages
+    SQLITE_CACHE_SIZE: int = -65536
+    SQLITE_TEMP_STORE: str = "MEMORY"
+
+    # SQL instrumentation: log statements slower than SLOW_QUERY_MS (0 = off)
+    # and statements repeated N_PLUS_ONE_THRESHOLD times in one request
+    SLOW_QUERY_MS: int = 200
+    N_PLUS_ONE_THRESHOLD: int = 10
 
     def get_database_url(self) -> str:
         if self.DATABASE_URL:
@@ -1,23 +1,289 @@
 import os
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, Optional
+
+from sqlalchemy import create_engine, event, exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from app.core.cache import TTLCache
 from app.core.config import settings
+from app.core.invalidation import invalidation_bus
+from app.core.request_metrics import current_request_metrics
+from app.core.query_budget import install_statement_budget
+# Registers the cursor listeners that count and time statements
+import app.core.query_metrics  # noqa: F401
 
 DATABASE_URL = settings.get_database_url()
 
-# Print database connection URL
-print("="*50)
-print("Database Connection URL:", DATABASE_URL)
-print("="*50)
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+class PoolMetrics:
+    """Checkout wait times and timeouts for a connection pool."""
+
+    def __init__(self, sample_size: int = 2048):
+        self._lock = threading.Lock()
+        self._wait_ms: deque = deque(maxlen=sample_size)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.max_wait_ms = 0.0
+
+    def record(self, wait_ms: float, timed_out: bool = False) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+                self._wait_ms.append(wait_ms)
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        metrics = current_request_metrics.get()
+        if metrics is not None:
+            metrics.db_wait_ms += wait_ms
+            metrics.db_checkouts += 1
+
+    def stats(self, pool) -> Dict[str, Any]:
+        with self._lock:
+            waits = sorted(self._wait_ms)
+        result = {
+            "pool": type(pool).__name__,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "wait_ms_p50": waits[len(waits) // 2] if waits else None,
+            "wait_ms_p99": waits[min(len(waits) - 1, int(len(waits) * 0.99))] if waits else None,
+            "wait_ms_max": self.max_wait_ms,
+        }
+        if isinstance(pool, QueuePool):
+            result.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(0, pool.overflow()),
+            })
+        return result
+
+
+pool_metrics = PoolMetrics()
+
+
+class TimedQueuePool(QueuePool):
+    """QueuePool that reports how long each checkout waited for a connection."""
+
+    metrics = pool_metrics
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            conn = super().connect()
+        except exc.TimeoutError:
+            self.metrics.record((time.perf_counter() - start) * 1000, timed_out=True)
+            raise
+        self.metrics.record((time.perf_counter() - start) * 1000)
+        return conn
+
+
+def _engine_options(url: str, pool_class=TimedQueuePool) -> Dict[str, Any]:
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # In-memory SQLite keeps its single-connection pool
+        return {}
+    return {
+        "poolclass": pool_class,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def sqlite_pragmas() -> Dict[str, Any]:
+    return {
+        "journal_mode": settings.SQLITE_JOURNAL_MODE,
+        "busy_timeout": settings.SQLITE_BUSY_TIMEOUT_MS,
+        "synchronous": settings.SQLITE_SYNCHRONOUS,
+        "mmap_size": settings.SQLITE_MMAP_SIZE,
+        "cache_size": settings.SQLITE_CACHE_SIZE,
+        "temp_store": settings.SQLITE_TEMP_STORE,
+    }
+
+
+def install_sqlite_pragmas(sync_engine, pragmas: Dict[str, Any] = None) -> None:
+    """
+    Set the SQLite pragmas on every new connection of the engine. WAL lets
+    readers proceed while a write is in progress, and busy_timeout makes
+    writers wait for the lock instead of failing with "database is locked".
+    Does nothing for other backends.
+    """
+    if sync_engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas() if pragmas is None else pragmas
+
+    @event.listens_for(sync_engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                if value is not None:
+                    cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
+
+
+# Async drivers for the engines get_database_url() can produce
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "mysql": "mysql+aiomysql",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    The URL with the backend's async driver swapped in. URLs that already
+    name an async driver are kept; any other backend has no supported async
+    driver and is rejected up front rather than failing inside SQLAlchemy.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend in ASYNC_DRIVERS:
+        parsed = parsed.set(drivername=ASYNC_DRIVERS[backend])
+    elif not parsed.get_dialect().is_async:
+        raise ValueError(
+            f"No supported async driver for {parsed.drivername!r}; use one of "
+            f"{', '.join(sorted(ASYNC_DRIVERS))} or a URL with an async driver"
+        )
+    return parsed.render_as_string(hide_password=False)
+
+
+def _async_engine_options(url: str) -> Dict[str, Any]:
+    options = _engine_options(url)
+    if options:
+        # Same pool settings on the asyncio-aware pool
+        options["poolclass"] = AsyncAdaptedQueuePool
+    return options
+
+
+REPLICA_DATABASE_URL = settings.DATABASE_REPLICA_URL
+
 Base = declarative_base()
 
-# Add this function:
+# Engines are built by init_engines() (app lifespan, scripts), not at import;
+# the session factories are bound to them there.
+engine = None
+async_engine = None
+replica_engine = None
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False)
+_engines_lock = threading.Lock()
+
+
+def _configure_engine(sync_engine) -> None:
+    install_sqlite_pragmas(sync_engine)
+    install_statement_budget(sync_engine)
+
+
+def init_engines():
+    """Create the engines and bind the session factories. Safe to call repeatedly."""
+    global engine, async_engine, replica_engine
+    if engine is not None:
+        return engine
+    with _engines_lock:
+        if engine is not None:
+            return engine
+        primary = create_engine(DATABASE_URL, **_engine_options(DATABASE_URL))
+        _configure_engine(primary)
+        async_primary = create_async_engine(
+            get_async_database_url(DATABASE_URL), **_async_engine_options(DATABASE_URL)
+        )
+        _configure_engine(async_primary.sync_engine)
+        replica = None
+        if REPLICA_DATABASE_URL:
+            replica = create_engine(
+                REPLICA_DATABASE_URL, **_engine_options(REPLICA_DATABASE_URL, pool_class=QueuePool)
+            )
+            _configure_engine(replica)
+        SessionLocal.configure(bind=primary)
+        AsyncSessionLocal.configure(bind=async_primary)
+        ReadSessionLocal.configure(bind=replica or primary)
+        engine, async_engine, replica_engine = primary, async_primary, replica
+        return engine
+
+
+async def dispose_engines() -> None:
+    if async_engine is not None:
+        await async_engine.dispose()
+    for sync_engine in (engine, replica_engine):
+        if sync_engine is not None:
+            sync_engine.dispose()
+
+# Set by the auth dependencies so sessions know whose write they commit
+current_user_id: ContextVar[Optional[int]] = ContextVar("current_user_id", default=None)
+
+# Users who committed a write recently; their reads stay on the primary
+# until the replica has had time to catch up. Every worker learns of a write
+# through the "writer" invalidation namespace, so the user's next request
+# sticks to the primary whichever worker serves it.
+recent_writers = TTLCache(maxsize=settings.PRINCIPAL_CACHE_SIZE, ttl=settings.READ_YOUR_WRITES_SECONDS)
+
+
+def _mark_writer(key: str) -> None:
+    recent_writers.set(int(key), True)
+
+
+invalidation_bus.subscribe("writer", _mark_writer)
+
+
+@event.listens_for(Session, "after_flush")
+def _flagged_write(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _flag_bulk_write(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _remember_writer(session):
+    if session.info.pop("wrote", False):
+        user_id = current_user_id.get()
+        # Without a replica every read is on the primary already
+        if user_id is not None and replica_engine is not None:
+            invalidation_bus.publish("writer", str(user_id))
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_write(session):
+    session.info.pop("wrote", None)
+
+
 def get_db():
+    init_engines()
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+def read_session(user_id: Optional[int] = None) -> Session:
+    """
+    Session for query-only work: the replica when one is configured, unless
+    the user wrote within the read-your-writes window.
+    """
+    init_engines()
+    if replica_engine is None or (user_id is not None and recent_writers.get(user_id) is not None):
+        return SessionLocal()
+    return ReadSessionLocal()
+
+
+async def get_async_db():
+    """Session for async routes, so database I/O never blocks the event loop."""
+    init_engines()
+    async with AsyncSessionLocal() as db:
+        yield db
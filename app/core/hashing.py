@@ -0,0 +1,121 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, status
+
+
+def _percentile(samples: list, q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    idx = min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+class PasswordHashPool:
+    """
+    Runs bcrypt work on its own bounded thread pool.
+
+    bcrypt releases the GIL, so a few dedicated threads use every core without
+    borrowing slots from the AnyIO threadpool that serves the sync routes.
+    Callers await the result on the event loop, so a waiting login holds no
+    thread at all. Admission is still capped at workers + max_pending to bound
+    the queue (and so the wait); anything beyond that is shed with a 503.
+    """
+
+    def __init__(self, workers: int, max_pending: int, retry_after: int = 1, sample_size: int = 1024):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.retry_after = retry_after
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._peak_in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        self._hash_ms: deque = deque(maxlen=sample_size)
+        self._wait_ms: deque = deque(maxlen=sample_size)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self._rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication is busy, please retry shortly",
+                headers={"Retry-After": str(self.retry_after)},
+            )
+        # The slot is freed when the hash finishes, even if the request is
+        # cancelled first, so admission keeps counting work still queued
+        future = self._submit(fn, *args)
+        return await asyncio.wrap_future(future)
+
+    def map(self, fn: Callable[[Any], Any], items: List[Any]) -> List[Any]:
+        """
+        Run fn over many items from a worker thread (bulk provisioning). At
+        most `workers` of them hold admission slots at a time, so logins keep
+        the max_pending slots; the caller waits for a slot instead of being
+        shed.
+        """
+        window = threading.Semaphore(self.workers)
+        futures = []
+        for item in items:
+            window.acquire()
+            self._slots.acquire()
+            future = self._submit(fn, item)
+            future.add_done_callback(lambda _: window.release())
+            futures.append(future)
+        return [future.result() for future in futures]
+
+    def _submit(self, fn: Callable[..., Any], *args: Any):
+        """Submit work whose admission slot is already held."""
+        with self._lock:
+            self._in_flight += 1
+            self._peak_in_flight = max(self._peak_in_flight, self._in_flight)
+        try:
+            future = self._executor.submit(self._timed, fn, time.perf_counter(), *args)
+        except BaseException:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._completed += 1
+        self._slots.release()
+
+    def _timed(self, fn: Callable[..., Any], submitted: float, *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return fn(*args)
+        finally:
+            finished = time.perf_counter()
+            with self._lock:
+                self._wait_ms.append((started - submitted) * 1000)
+                self._hash_ms.append((finished - started) * 1000)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            hash_ms = list(self._hash_ms)
+            wait_ms = list(self._wait_ms)
+            in_flight = self._in_flight
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "in_flight": in_flight,
+                "queue_depth": max(0, in_flight - self.workers),
+                "peak_in_flight": self._peak_in_flight,
+                "completed": self._completed,
+                "rejected": self._rejected,
+                "hash_ms_p50": _percentile(hash_ms, 0.50),
+                "hash_ms_p99": _percentile(hash_ms, 0.99),
+                "wait_ms_p50": _percentile(wait_ms, 0.50),
+                "wait_ms_p99": _percentile(wait_ms, 0.99),
+            }
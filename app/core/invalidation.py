@@ -0,0 +1,271 @@
+import json
+import logging
+import queue
+import select
+import sqlite3
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings, BASE_DIR
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[str], None]
+
+
+class LocalInvalidationBackend:
+    """Single process: local handlers already ran, nothing to broadcast."""
+
+    def publish(self, payload: str) -> None:
+        pass
+
+    def start(self, deliver: Callable[[str], None]) -> None:
+        pass
+
+    def stop(self) -> None:
+        pass
+
+
+class SQLiteInvalidationBackend:
+    """
+    Messages appended to a small SQLite file that every worker on the host
+    polls. Kept out of the application database, like the login limiter.
+    """
+
+    def __init__(self, path: str, poll_interval: float, retention_seconds: int = 60):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.retention_seconds = retention_seconds
+        self._local = threading.local()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_invalidation "
+                "(id INTEGER PRIMARY KEY AUTOINCREMENT, payload TEXT NOT NULL, created_at REAL NOT NULL)"
+            )
+            self._local.conn = conn
+        return conn
+
+    def publish(self, payload: str) -> None:
+        self._connect().execute(
+            "INSERT INTO cache_invalidation (payload, created_at) VALUES (?, ?)", (payload, time.time())
+        )
+
+    def start(self, deliver: Callable[[str], None]) -> None:
+        # Only messages published after this worker started matter
+        last_id = self._connect().execute("SELECT COALESCE(MAX(id), 0) FROM cache_invalidation").fetchone()[0]
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._poll, args=(deliver, last_id), name="cache-invalidation", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _poll(self, deliver: Callable[[str], None], last_id: int) -> None:
+        conn = self._connect()
+        last_purge = time.monotonic()
+        while not self._stop.wait(self.poll_interval):
+            try:
+                rows = conn.execute(
+                    "SELECT id, payload FROM cache_invalidation WHERE id > ? ORDER BY id", (last_id,)
+                ).fetchall()
+                for row_id, payload in rows:
+                    last_id = row_id
+                    deliver(payload)
+                if time.monotonic() - last_purge >= self.retention_seconds:
+                    last_purge = time.monotonic()
+                    conn.execute(
+                        "DELETE FROM cache_invalidation WHERE created_at < ?", (time.time() - self.retention_seconds,)
+                    )
+            except sqlite3.Error:
+                logger.exception("Polling cache invalidations failed")
+
+
+class PostgresInvalidationBackend:
+    """LISTEN/NOTIFY on a dedicated connection per worker."""
+
+    def __init__(self, url: str, channel: str = "cache_invalidation"):
+        import psycopg2
+
+        self._psycopg2 = psycopg2
+        self.dsn = make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+        self.channel = channel
+        self._publish_conn = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _connect(self):
+        conn = self._psycopg2.connect(self.dsn)
+        conn.autocommit = True
+        return conn
+
+    def publish(self, payload: str) -> None:
+        with self._lock:
+            try:
+                if self._publish_conn is None or self._publish_conn.closed:
+                    self._publish_conn = self._connect()
+                with self._publish_conn.cursor() as cur:
+                    cur.execute("SELECT pg_notify(%s, %s)", (self.channel, payload))
+            except self._psycopg2.Error:
+                self._publish_conn = None
+                raise
+
+    def start(self, deliver: Callable[[str], None]) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._listen, args=(deliver,), name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def _listen(self, deliver: Callable[[str], None]) -> None:
+        while not self._stop.is_set():
+            try:
+                conn = self._connect()
+                with conn.cursor() as cur:
+                    cur.execute(f'LISTEN "{self.channel}"')
+                while not self._stop.is_set():
+                    if select.select([conn], [], [], 1.0)[0]:
+                        conn.poll()
+                        while conn.notifies:
+                            deliver(conn.notifies.pop(0).payload)
+                conn.close()
+            except self._psycopg2.Error:
+                logger.exception("Cache invalidation listener lost its connection, reconnecting")
+                self._stop.wait(1)
+
+
+class InvalidationBus:
+    """
+    Broadcasts keyed cache invalidations to every worker.
+
+    publish() runs this worker's handlers right away and queues the message
+    for the backend; the other workers run theirs when it arrives. While the
+    bus is started a sender thread does the broadcast, so publishing never
+    does I/O on the caller's thread (async handlers call it on the event
+    loop). A failed broadcast is logged, not raised: cache TTLs still bound
+    the staleness.
+    """
+
+    def __init__(self, backend, sample_size: int = 1024):
+        self.backend = backend
+        self.origin = uuid.uuid4().hex
+        self._handlers: Dict[str, List[Handler]] = {}
+        self._latency_ms: deque = deque(maxlen=sample_size)
+        self._outbox: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._sender: Optional[threading.Thread] = None
+        self._started = False
+        self.published = 0
+        self.received = 0
+
+    def subscribe(self, namespace: str, handler: Handler) -> None:
+        self._handlers.setdefault(namespace, []).append(handler)
+
+    def _run_handlers(self, namespace: str, key: str) -> None:
+        for handler in self._handlers.get(namespace, ()):
+            try:
+                handler(key)
+            except Exception:
+                logger.exception("Cache invalidation handler failed for %s:%s", namespace, key)
+
+    def publish(self, namespace: str, key: str) -> None:
+        self._run_handlers(namespace, key)
+        self.published += 1
+        payload = json.dumps({"o": self.origin, "n": namespace, "k": key, "t": time.time()})
+        if self._sender is not None:
+            self._outbox.put(payload)
+        else:
+            # Not started (scripts, CLI): broadcast inline
+            self._send(payload)
+
+    def _send(self, payload: str) -> None:
+        try:
+            self.backend.publish(payload)
+        except Exception:
+            logger.exception("Broadcasting cache invalidation %s failed", payload)
+
+    def _drain(self) -> None:
+        while True:
+            payload = self._outbox.get()
+            if payload is None:
+                return
+            self._send(payload)
+
+    def _deliver(self, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            return
+        if message.get("o") == self.origin:
+            return
+        self.received += 1
+        self._latency_ms.append((time.time() - message.get("t", time.time())) * 1000)
+        self._run_handlers(message["n"], message["k"])
+
+    def start(self) -> None:
+        if not self._started:
+            self.backend.start(self._deliver)
+            self._sender = threading.Thread(target=self._drain, name="cache-invalidation-sender", daemon=True)
+            self._sender.start()
+            self._started = True
+
+    def stop(self) -> None:
+        if self._started:
+            sender, self._sender = self._sender, None
+            self._outbox.put(None)
+            sender.join(timeout=5)
+            # Anything queued after the sentinel still goes out
+            while True:
+                try:
+                    payload = self._outbox.get_nowait()
+                except queue.Empty:
+                    break
+                if payload is not None:
+                    self._send(payload)
+            self.backend.stop()
+            self._started = False
+
+    def stats(self) -> Dict[str, Any]:
+        latencies = sorted(self._latency_ms)
+        return {
+            "backend": type(self.backend).__name__,
+            "published": self.published,
+            "received": self.received,
+            "outbox": self._outbox.qsize(),
+            "latency_ms_p50": latencies[len(latencies) // 2] if latencies else None,
+            "latency_ms_p99": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else None,
+        }
+
+
+def build_invalidation_backend(kind: Optional[str] = None):
+    kind = (kind or settings.INVALIDATION_BUS_BACKEND).lower()
+    if kind == "auto":
+        kind = "postgres" if make_url(settings.get_database_url()).get_backend_name() == "postgresql" else "sqlite"
+    if kind == "postgres":
+        return PostgresInvalidationBackend(settings.get_database_url())
+    if kind == "sqlite":
+        path = settings.INVALIDATION_BUS_SQLITE_PATH or str(BASE_DIR / "cache_invalidation.db")
+        return SQLiteInvalidationBackend(path, settings.INVALIDATION_BUS_POLL_INTERVAL_MS / 1000)
+    return LocalInvalidationBackend()
+
+
+invalidation_bus = InvalidationBus(build_invalidation_backend())
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.core import database
+
+logger = logging.getLogger(__name__)
+
+MaintenanceJob = Callable[[Session], Any]
+
+_jobs: List[Tuple[str, float, MaintenanceJob]] = []
+
+
+def periodic(name: str, interval_seconds: float):
+    """
+    Register a housekeeping job to run every interval_seconds in the
+    background, off the request path. It gets its own write session and
+    runs in a worker thread.
+    """
+    def register(fn: MaintenanceJob) -> MaintenanceJob:
+        _jobs.append((name, interval_seconds, fn))
+        return fn
+    return register
+
+
+class MaintenanceState:
+    """What the metrics endpoint reports about the background jobs."""
+
+    def __init__(self):
+        self.runs: Dict[str, int] = {}
+        self.last_ms: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"runs": dict(self.runs), "last_ms": dict(self.last_ms), "errors": dict(self.errors)}
+
+
+maintenance_state = MaintenanceState()
+
+
+def _run_job(name: str, fn: MaintenanceJob) -> None:
+    start = time.perf_counter()
+    db = database.SessionLocal()
+    try:
+        fn(db)
+        maintenance_state.errors.pop(name, None)
+    except Exception as e:
+        db.rollback()
+        maintenance_state.errors[name] = str(e)
+        logger.exception("Maintenance job %s failed", name)
+    finally:
+        db.close()
+        maintenance_state.runs[name] = maintenance_state.runs.get(name, 0) + 1
+        maintenance_state.last_ms[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+async def _loop(name: str, interval: float, fn: MaintenanceJob) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(_run_job, name, fn)
+
+
+async def run_maintenance() -> None:
+    """Run every registered job on its interval until cancelled."""
+    await asyncio.gather(*(_loop(name, interval, fn) for name, interval, fn in _jobs))
@@ -0,0 +1,133 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.util import await_only
+
+from app.core.config import settings
+from app.core.request_metrics import current_request_metrics
+
+logger = logging.getLogger(__name__)
+
+# Budget (ms) declared by the route being served; None means the default
+statement_timeout_ms: ContextVar[Optional[int]] = ContextVar("statement_timeout_ms", default=None)
+
+# SQLite VM instructions between deadline checks
+SQLITE_PROGRESS_STEPS = 1000
+
+# PostgreSQL SQLSTATE for query_canceled
+PG_QUERY_CANCELED = "57014"
+
+
+def statement_budget(timeout_ms: int):
+    """
+    Dependency that sets the per-statement time budget for a route or router:
+
+        router = APIRouter(dependencies=[Depends(statement_budget(2000))])
+    """
+    async def set_statement_budget():
+        statement_timeout_ms.set(timeout_ms)
+    return set_statement_budget
+
+
+def current_budget_ms() -> Optional[int]:
+    """Budget for statements run now; only requests get the default."""
+    timeout_ms = statement_timeout_ms.get()
+    if timeout_ms is None and current_request_metrics.get() is not None:
+        timeout_ms = settings.DB_STATEMENT_TIMEOUT_MS
+    return timeout_ms or None
+
+
+class _Deadline:
+    __slots__ = ("at",)
+
+    def __init__(self):
+        self.at: Optional[float] = None
+
+    def expired(self) -> bool:
+        return self.at is not None and time.monotonic() > self.at
+
+
+def _set_progress_handler(dbapi_connection, handler) -> None:
+    if hasattr(dbapi_connection, "set_progress_handler"):
+        dbapi_connection.set_progress_handler(handler, SQLITE_PROGRESS_STEPS)
+    else:
+        # aiosqlite runs the connection on its own thread; go through its API
+        await_only(dbapi_connection._connection.set_progress_handler(handler, SQLITE_PROGRESS_STEPS))
+
+
+def install_statement_budget(sync_engine) -> None:
+    """
+    Enforce current_budget_ms() on every statement of the engine.
+
+    PostgreSQL gets a session statement_timeout, re-issued only when the
+    budget changes. SQLite gets a progress handler that interrupts the
+    statement once its deadline has passed. Other backends are left alone.
+    """
+    backend = sync_engine.dialect.name
+
+    if backend == "sqlite":
+        @event.listens_for(sync_engine, "connect")
+        def _install_deadline(dbapi_connection, connection_record):
+            deadline = _Deadline()
+            connection_record.info["deadline"] = deadline
+            _set_progress_handler(dbapi_connection, deadline.expired)
+
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _arm_deadline(conn, cursor, statement, parameters, context, executemany):
+            deadline = conn.info.get("deadline")
+            if deadline is not None:
+                timeout_ms = current_budget_ms()
+                deadline.at = time.monotonic() + timeout_ms / 1000 if timeout_ms else None
+
+        @event.listens_for(sync_engine, "checkin")
+        def _disarm_deadline(dbapi_connection, connection_record):
+            deadline = connection_record.info.get("deadline")
+            if deadline is not None:
+                deadline.at = None
+
+    elif backend == "postgresql":
+        @event.listens_for(sync_engine, "before_cursor_execute")
+        def _set_statement_timeout(conn, cursor, statement, parameters, context, executemany):
+            timeout_ms = current_budget_ms() or 0
+            if conn.info.get("statement_timeout") != timeout_ms:
+                cursor.execute(f"SET statement_timeout = {int(timeout_ms)}")
+                conn.info["statement_timeout"] = timeout_ms
+
+        # A rolled back transaction also undoes the SET
+        @event.listens_for(sync_engine, "rollback")
+        def _forget_statement_timeout(conn):
+            conn.info.pop("statement_timeout", None)
+
+        @event.listens_for(sync_engine, "reset")
+        def _forget_statement_timeout_on_reset(dbapi_connection, connection_record, reset_state):
+            connection_record.info.pop("statement_timeout", None)
+
+
+def is_statement_timeout(exc: DBAPIError) -> bool:
+    orig = exc.orig
+    if PG_QUERY_CANCELED in (getattr(orig, "pgcode", None), getattr(orig, "sqlstate", None)):
+        return True
+    return "interrupted" in str(orig)
+
+
+async def statement_timeout_handler(request: Request, exc: DBAPIError):
+    if not is_statement_timeout(exc):
+        raise exc
+    route = request.scope.get("route")
+    logger.warning(
+        "Statement budget of %s ms exceeded in %s %s: %s",
+        current_budget_ms(),
+        request.method,
+        getattr(route, "path", request.url.path),
+        " ".join((exc.statement or "").split()),
+    )
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "The database query took too long, please try again later"},
+    )
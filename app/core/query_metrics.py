@@ -0,0 +1,82 @@
+import logging
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.request_metrics import current_request_metrics
+
+logger = logging.getLogger(__name__)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _start_timer(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _record_statement(conn, cursor, statement, parameters, context, executemany):
+    elapsed_ms = (time.perf_counter() - conn.info["query_start"].pop()) * 1000
+    metrics = current_request_metrics.get()
+    if metrics is not None:
+        metrics.db_queries += 1
+        metrics.db_time_ms += elapsed_ms
+        metrics.statements[statement] += 1
+    if settings.SLOW_QUERY_MS and elapsed_ms >= settings.SLOW_QUERY_MS:
+        logger.warning("Slow query (%.1f ms): %s", elapsed_ms, " ".join(statement.split()))
+
+
+@event.listens_for(Engine, "handle_error")
+def _drop_timer(exception_context):
+    conn = exception_context.connection
+    if conn is not None and conn.info.get("query_start"):
+        conn.info["query_start"].pop()
+
+
+class QueryLog:
+    """Statements seen by count_queries(), from every thread and engine."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.statements: List[str] = []
+
+    def add(self, statement: str) -> None:
+        with self._lock:
+            self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self, threshold: int = 2) -> Counter:
+        return Counter({s: n for s, n in Counter(self.statements).items() if n >= threshold})
+
+
+@contextmanager
+def count_queries(max_queries: Optional[int] = None) -> Iterator[QueryLog]:
+    """
+    Record every statement executed inside the block and, when max_queries is
+    given, fail if more than that many ran:
+
+        with count_queries(max_queries=3):
+            client.get("/api/v1/tests/?type=DASS", headers=headers)
+    """
+    log = QueryLog()
+
+    def _collect(conn, cursor, statement, parameters, context, executemany):
+        log.add(statement)
+
+    event.listen(Engine, "after_cursor_execute", _collect)
+    try:
+        yield log
+    finally:
+        event.remove(Engine, "after_cursor_execute", _collect)
+    if max_queries is not None and log.count > max_queries:
+        raise AssertionError(
+            f"Expected at most {max_queries} queries, {log.count} ran:\n" + "\n".join(log.statements)
+        )
@@ -0,0 +1,222 @@
+import sqlite3
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException, status
+from fastapi.concurrency import run_in_threadpool
+
+from app.core.config import settings, BASE_DIR
+
+
+class MemoryRateLimitBackend:
+    """Per-process sliding-window log of attempt timestamps."""
+
+    blocking = False
+
+    def __init__(self, sweep_every: int = 1000):
+        self._events: Dict[str, deque] = {}
+        self._lock = threading.Lock()
+        self._sweep_every = sweep_every
+        self._adds = 0
+
+    def reserve(self, key: str, now: float, since: float, limit: int) -> Optional[float]:
+        """
+        Count an attempt unless the window is full. Returns None when the
+        attempt was counted, else the oldest timestamp in the window.
+        """
+        with self._lock:
+            events = self._events.setdefault(key, deque())
+            while events and events[0] <= since:
+                events.popleft()
+            if len(events) >= limit:
+                return events[0]
+            events.append(now)
+            self._adds += 1
+            if self._adds % self._sweep_every == 0:
+                # Drop keys whose whole window has passed
+                for stale in [k for k, v in self._events.items() if not v or v[-1] <= since]:
+                    del self._events[stale]
+            return None
+
+    def release(self, key: str, ts: float) -> None:
+        with self._lock:
+            events = self._events.get(key)
+            if events and ts in events:
+                events.remove(ts)
+
+    def reset(self, key: str) -> None:
+        with self._lock:
+            self._events.pop(key, None)
+
+
+class SQLiteRateLimitBackend:
+    """
+    Sliding-window log in a small SQLite file, shared by every worker on the
+    host. Kept separate from the application database so limiter writes never
+    contend with it.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS login_attempt (key TEXT NOT NULL, ts REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_login_attempt_key_ts ON login_attempt (key, ts)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def reserve(self, key: str, now: float, since: float, limit: int) -> Optional[float]:
+        conn = self._connect()
+        # Count and insert under one write lock so concurrent workers cannot
+        # all see room in the window
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM login_attempt WHERE key = ? AND ts <= ?", (key, since))
+            count, oldest = conn.execute(
+                "SELECT COUNT(*), MIN(ts) FROM login_attempt WHERE key = ?", (key,)
+            ).fetchone()
+            if count >= limit:
+                conn.execute("COMMIT")
+                return oldest
+            conn.execute("INSERT INTO login_attempt (key, ts) VALUES (?, ?)", (key, now))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return None
+
+    def release(self, key: str, ts: float) -> None:
+        self._connect().execute(
+            "DELETE FROM login_attempt WHERE rowid = (SELECT rowid FROM login_attempt WHERE key = ? AND ts = ? LIMIT 1)",
+            (key, ts),
+        )
+
+    def reset(self, key: str) -> None:
+        self._connect().execute("DELETE FROM login_attempt WHERE key = ?", (key,))
+
+
+class LoginRateLimiter:
+    """
+    Counts failed logins per normalized email and per client IP over a
+    sliding window. reserve() counts the attempt before any password
+    hashing, in one atomic step per key, so concurrent guesses cannot all
+    pass the check and rejected attempts cost no bcrypt work. A successful
+    login gives its slots back with record_success().
+
+    The backend is built on first use, so importing the app opens no files.
+    """
+
+    def __init__(
+        self, backend_factory: Callable[[], Any], max_per_account: int, max_per_ip: int, window_seconds: int
+    ):
+        self._backend_factory = backend_factory
+        self._backend = None
+        self._lock = threading.Lock()
+        self.max_per_account = max_per_account
+        self.max_per_ip = max_per_ip
+        self.window_seconds = window_seconds
+        self.rejected = 0
+
+    @property
+    def backend(self):
+        backend = self._backend
+        if backend is None:
+            with self._lock:
+                if self._backend is None:
+                    self._backend = self._backend_factory()
+                backend = self._backend
+        return backend
+
+    @staticmethod
+    def _account_key(email: str) -> str:
+        return "account:" + email.strip().lower()
+
+    @staticmethod
+    def _ip_key(ip: str) -> str:
+        return "ip:" + ip
+
+    def _keys(self, email: str, ip: Optional[str]):
+        yield self._account_key(email), self.max_per_account
+        if ip:
+            yield self._ip_key(ip), self.max_per_ip
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Call reserve/record_success from async code: inline for
+        the in-memory backend, on the threadpool for one that does file I/O.
+        """
+        if self.backend.blocking:
+            return await run_in_threadpool(fn, *args)
+        return fn(*args)
+
+    def reserve(self, email: str, ip: Optional[str]) -> float:
+        """
+        Count this attempt as a failure up front, or raise 429 when a window
+        is full. Returns the timestamp to hand back to record_success().
+        """
+        now = time.time()
+        since = now - self.window_seconds
+        reserved = []
+        for key, limit in self._keys(email, ip):
+            oldest = self.backend.reserve(key, now, since, limit)
+            if oldest is not None:
+                # The attempt is refused, so it does not count against the other key
+                for held in reserved:
+                    self.backend.release(held, now)
+                self.rejected += 1
+                retry_after = max(1, int(oldest + self.window_seconds - now) + 1)
+                raise HTTPException(
+                    status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                    detail="Too many failed login attempts, please try again later",
+                    headers={"Retry-After": str(retry_after)},
+                )
+            reserved.append(key)
+        return now
+
+    def release(self, email: str, ip: Optional[str], reserved_at: float) -> None:
+        """Give back an attempt that never got to the password check."""
+        for key, _ in self._keys(email, ip):
+            self.backend.release(key, reserved_at)
+
+    def record_success(self, email: str, ip: Optional[str], reserved_at: float) -> None:
+        # The account counter is cleared; for the IP only this attempt's slot
+        # is given back, so an attacker logging into their own account cannot
+        # wipe the per-IP history.
+        self.backend.reset(self._account_key(email))
+        if ip:
+            self.backend.release(self._ip_key(ip), reserved_at)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "backend": type(self._backend).__name__ if self._backend is not None else None,
+            "max_per_account": self.max_per_account,
+            "max_per_ip": self.max_per_ip,
+            "window_seconds": self.window_seconds,
+            "rejected": self.rejected,
+        }
+
+
+def _build_login_backend():
+    if settings.LOGIN_RATE_LIMIT_BACKEND.lower() == "sqlite":
+        path = settings.LOGIN_RATE_LIMIT_SQLITE_PATH or str(BASE_DIR / "login_rate_limit.db")
+        return SQLiteRateLimitBackend(path)
+    return MemoryRateLimitBackend()
+
+
+login_rate_limiter = LoginRateLimiter(
+    backend_factory=_build_login_backend,
+    max_per_account=settings.LOGIN_MAX_FAILED_PER_ACCOUNT,
+    max_per_ip=settings.LOGIN_MAX_FAILED_PER_IP,
+    window_seconds=settings.LOGIN_RATE_LIMIT_WINDOW_SECONDS,
+)
@@ -0,0 +1,62 @@
+import logging
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Optional
+
+from fastapi import Request
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class RequestMetrics:
+    """Latency figures collected while serving one request."""
+    db_wait_ms: float = 0.0
+    db_checkouts: int = 0
+    db_queries: int = 0
+    db_time_ms: float = 0.0
+    # Executions per statement text, for N+1 detection
+    statements: Counter = field(default_factory=Counter)
+
+
+# The middleware installs one RequestMetrics per request. Sync handlers run in
+# a copy of the context, but they share the same object, so their updates
+# are visible here.
+current_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar(
+    "current_request_metrics", default=None
+)
+
+
+def report_repeated_statements(metrics: RequestMetrics, label: str) -> None:
+    """Warn about statements executed often enough to look like an N+1 loop."""
+    threshold = settings.N_PLUS_ONE_THRESHOLD
+    if threshold <= 0:
+        return
+    for statement, count in metrics.statements.items():
+        if count >= threshold:
+            logger.warning("Suspected N+1 in %s: %d executions of %s", label, count, " ".join(statement.split()))
+
+
+def server_timing(metrics: RequestMetrics, total_ms: float) -> str:
+    return ", ".join([
+        f'db;dur={metrics.db_time_ms:.2f};desc="queries: {metrics.db_queries}"',
+        f'db-wait;dur={metrics.db_wait_ms:.2f};desc="pool checkouts: {metrics.db_checkouts}"',
+        f"total;dur={total_ms:.2f}",
+    ])
+
+
+async def track_request_metrics(request: Request, call_next):
+    metrics = RequestMetrics()
+    token = current_request_metrics.set(metrics)
+    start = time.perf_counter()
+    try:
+        response = await call_next(request)
+    finally:
+        current_request_metrics.reset(token)
+        report_repeated_statements(metrics, f"{request.method} {request.url.path}")
+    response.headers["Server-Timing"] = server_timing(metrics, (time.perf_counter() - start) * 1000)
+    return response
@@ -0,0 +1,109 @@
+import threading
+from datetime import datetime
+from typing import Any, Dict
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.bloom import BloomFilter
+from app.core.config import settings
+from app.core.maintenance import periodic
+from app.models.models import RevokedToken
+
+
+class RefreshTokenRevocations:
+    """
+    Used/revoked refresh-token jtis, stored in ``revoked_token`` and fronted by
+    a Bloom filter.
+
+    The common "never seen this jti" case is answered from memory. Only Bloom
+    positives query the table. Recording a jti is a plain INSERT on its
+    primary key, so two workers racing to rotate the same token cannot both
+    succeed even though each keeps its own filter. That same primary key
+    catches a replay whose jti was recorded while the filter was being
+    rebuilt, so the table is scanned without holding the lock.
+    """
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._lock = threading.Lock()
+        self._loaded = False
+        self.bloom_negatives = 0
+        self.db_checks = 0
+
+    def _build(self, db: Session) -> BloomFilter:
+        bloom = BloomFilter(self.capacity, self.error_rate)
+        rows = db.query(RevokedToken.jti).filter(RevokedToken.expires_at > datetime.utcnow())
+        for (jti,) in rows.yield_per(1000):
+            bloom.add(jti)
+        return bloom
+
+    def _load(self, db: Session) -> None:
+        bloom = self._build(db)
+        with self._lock:
+            self._bloom = bloom
+            self._loaded = True
+
+    def is_revoked(self, jti: str, db: Session) -> bool:
+        if not self._loaded:
+            self._load(db)
+        with self._lock:
+            if jti not in self._bloom:
+                self.bloom_negatives += 1
+                return False
+            self.db_checks += 1
+        return db.query(RevokedToken.jti).filter(RevokedToken.jti == jti).first() is not None
+
+    def revoke(self, jti: str, user_id: int, expires_at: datetime, db: Session) -> bool:
+        """
+        Record the jti as used. Returns False when it already was (a replay).
+        The caller commits.
+        """
+        db.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+        try:
+            db.flush()
+        except IntegrityError:
+            db.rollback()
+            with self._lock:
+                self._bloom.add(jti)
+            return False
+        with self._lock:
+            self._bloom.add(jti)
+        return True
+
+    def purge_expired(self, db: Session) -> int:
+        """
+        Delete expired entries and rebuild the filter from what is left.
+        Runs in the background every REVOKED_TOKEN_PURGE_INTERVAL_SECONDS
+        (see purge_revoked_tokens).
+        """
+        deleted = (
+            db.query(RevokedToken)
+            .filter(RevokedToken.expires_at <= datetime.utcnow())
+            .delete(synchronize_session=False)
+        )
+        db.commit()
+        self._load(db)
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "bloom_entries": self._bloom.count,
+            "bloom_capacity": self.capacity,
+            "bloom_negatives": self.bloom_negatives,
+            "db_checks": self.db_checks,
+        }
+
+
+refresh_token_revocations = RefreshTokenRevocations(
+    capacity=settings.REVOKED_TOKEN_BLOOM_CAPACITY,
+    error_rate=settings.REVOKED_TOKEN_BLOOM_ERROR_RATE,
+)
+
+
+@periodic("revoked_token_purge", settings.REVOKED_TOKEN_PURGE_INTERVAL_SECONDS)
+def purge_revoked_tokens(db: Session) -> None:
+    # Every worker runs it: the DELETE is idempotent and each rebuilds its own filter
+    refresh_token_revocations.purge_expired(db)
@@ -0,0 +1,129 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import QueuePool
+
+from app.core import database
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+WarmupStep = Callable[[Session], None]
+
+_steps: List[Tuple[str, WarmupStep]] = []
+
+
+def warmup(name: str):
+    """
+    Register a function to run during the startup warm-up. It gets a read
+    session and should run the hot read path it stands for (queries, model
+    building, cache filling) the way a request would.
+    """
+    def register(fn: WarmupStep) -> WarmupStep:
+        _steps.append((name, fn))
+        return fn
+    return register
+
+
+class WarmupState:
+    """What /ready and the metrics endpoint report about the warm-up."""
+
+    def __init__(self):
+        self.ready = False
+        self.duration_ms: Optional[float] = None
+        self.timed_out = False
+        self.steps: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "duration_ms": self.duration_ms,
+            "timed_out": self.timed_out,
+            "steps_ms": dict(self.steps),
+            "errors": dict(self.errors),
+        }
+
+
+warmup_state = WarmupState()
+
+
+def _pool_size(sync_engine) -> int:
+    pool = sync_engine.pool
+    return pool.size() if isinstance(pool, QueuePool) else 1
+
+
+def warm_pool(sync_engine, deadline: float) -> None:
+    """Open the pool's steady-state connections at once and hand them back."""
+    connections = []
+    try:
+        for _ in range(_pool_size(sync_engine)):
+            if time.monotonic() >= deadline:
+                break
+            connections.append(sync_engine.connect())
+    finally:
+        for conn in connections:
+            conn.close()
+
+
+async def warm_async_pool(async_engine, deadline: float) -> None:
+    connections = []
+    try:
+        for _ in range(_pool_size(async_engine.sync_engine)):
+            if time.monotonic() >= deadline:
+                break
+            connections.append(await async_engine.connect())
+    finally:
+        for conn in connections:
+            await conn.close()
+
+
+def _run_step(name: str, fn: WarmupStep) -> None:
+    start = time.perf_counter()
+    db = database.read_session()
+    try:
+        fn(db)
+    except Exception as e:
+        warmup_state.errors[name] = str(e)
+        logger.exception("Warm-up step %s failed", name)
+    finally:
+        db.close()
+        warmup_state.steps[name] = round((time.perf_counter() - start) * 1000, 1)
+
+
+async def _warm(deadline: float) -> None:
+    database.init_engines()
+    start = time.perf_counter()
+    for sync_engine in (database.engine, database.replica_engine):
+        if sync_engine is not None:
+            await asyncio.to_thread(warm_pool, sync_engine, deadline)
+    await warm_async_pool(database.async_engine, deadline)
+    warmup_state.steps["pools"] = round((time.perf_counter() - start) * 1000, 1)
+    for name, fn in _steps:
+        if time.monotonic() >= deadline:
+            break
+        await asyncio.to_thread(_run_step, name, fn)
+
+
+async def warm_up(timeout: Optional[float] = None) -> None:
+    """
+    Open the pools and run the registered warm-up steps, then mark the
+    worker ready. Bounded by WARMUP_TIMEOUT_SECONDS: past it the worker is
+    marked ready anyway and the remaining steps are skipped.
+    """
+    timeout = settings.WARMUP_TIMEOUT_SECONDS if timeout is None else timeout
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(_warm(time.monotonic() + timeout), timeout)
+    except asyncio.TimeoutError:
+        warmup_state.timed_out = True
+        logger.warning("Warm-up timed out after %ss", timeout)
+    except Exception:
+        logger.exception("Warm-up failed")
+    finally:
+        warmup_state.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        warmup_state.ready = True
+        logger.info("Warm-up finished in %.0f ms: %s", warmup_state.duration_ms, warmup_state.steps)
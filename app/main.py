@@ -1,20 +1,53 @@
-from fastapi import FastAPI, Depends, HTTPException
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Depends, HTTPException, Security
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
 from fastapi.openapi.utils import get_openapi
-
-from app.core.database import engine, Base
+from fastapi.responses import JSONResponse
+
+from sqlalchemy.exc import DBAPIError
+
+from app.core.bootstrap import ensure_schema
+from app.core.database import dispose_engines, init_engines
+from app.core.invalidation import invalidation_bus
+from app.core.maintenance import run_maintenance
+from app.core.query_budget import statement_timeout_handler
+from app.core.request_metrics import track_request_metrics
+from app.core.warmup import warm_up, warmup_state
+from app.core.config import settings
 from app.routers import users, posts, test, auth
-from app.core.auth import get_current_user
-from app.models.models import User
+from app.core.auth import get_current_principal, Principal
 from app.routers.attendance import router as attendance_router
 from app.routers.situational import router as situational_router
 from app.routers.chat import router as chat_router
+from app.routers.metrics import router as metrics_router
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Alembic owns the schema: migrate an empty or older database to head
+    await asyncio.to_thread(ensure_schema)
+    init_engines()
+    invalidation_bus.start()
+    # Serve right away; /ready stays 503 until the warm-up is done
+    if settings.WARMUP_ENABLED:
+        warmup_task = asyncio.create_task(warm_up())
+    else:
+        warmup_task = None
+        warmup_state.ready = True
+    # Housekeeping (ledger compaction) runs on its own schedule, not in requests
+    maintenance_task = asyncio.create_task(run_maintenance())
+    yield
+    maintenance_task.cancel()
+    if warmup_task is not None:
+        warmup_task.cancel()
+    invalidation_bus.stop()
+    await dispose_engines()
 
-# Create database tables for the first time
-Base.metadata.create_all(bind=engine)
 
 app = FastAPI(
+    lifespan=lifespan,
     title="Psychology API",
     description="""
     API for Psychology Application.
@@ -33,6 +66,7 @@ app = FastAPI(
     - `users:read`: Read user information
     - `users:write`: Modify user information
     - `users:delete`: Delete user account
+    - `users:admin`: Administer other users (granted to accounts with `is_admin`)
     
     Regular users get `users:read` scope, while premium users get all scopes.
     """,
@@ -41,7 +75,11 @@ app = FastAPI(
     redoc_url=None,  # Disable default redoc
 )
 
+app.middleware("http")(track_request_metrics)
+app.add_exception_handler(DBAPIError, statement_timeout_handler)
+
 # Configure CORS
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],  # In production, replace with specific origins
@@ -52,11 +90,11 @@ app.add_middleware(
 
 # Include routers with authentication
 app.include_router(auth.router, prefix="/api/v1")
-app.include_router(users, prefix="/api/v1", dependencies=[Depends(get_current_user)])
-app.include_router(posts, prefix="/api/v1", dependencies=[Depends(get_current_user)])
-app.include_router(test, prefix="/api/v1", dependencies=[Depends(get_current_user)])
+app.include_router(users, prefix="/api/v1", dependencies=[Depends(get_current_principal)])
+app.include_router(posts, prefix="/api/v1", dependencies=[Depends(get_current_principal)])
+app.include_router(test, prefix="/api/v1", dependencies=[Depends(get_current_principal)])
 app.include_router(
-    attendance_router, prefix="/api/v1", dependencies=[Depends(get_current_user)]
+    attendance_router, prefix="/api/v1", dependencies=[Depends(get_current_principal)]
 )
 app.include_router(
     situational_router, prefix="/api/v1"
@@ -64,6 +102,10 @@ app.include_router(
 app.include_router(
     chat_router, prefix="/api/v1"
 )
+app.include_router(
+    # Limiter thresholds and pool/cache internals are for operators only
+    metrics_router, prefix="/api/v1", dependencies=[Security(get_current_principal, scopes=["users:admin"])]
+)
 
 
 # Custom OpenAPI schema with security scheme
@@ -143,13 +185,20 @@ async def root():
     return {"message": "Welcome to Psychology API"}
 
 
-def admin_required(current_user: User = Depends(get_current_user)):
+@app.get("/ready", tags=["root"])
+async def ready():
+    if not warmup_state.ready:
+        return JSONResponse(status_code=503, content={"status": "warming up"})
+    return {"status": "ready", "warmup_ms": warmup_state.duration_ms}
+
+
+def admin_required(current_user: Principal = Depends(get_current_principal)):
     if not current_user.is_admin:
         raise HTTPException(status_code=403, detail="Admin only")
     return current_user
 
 
-def premium_required(current_user: User = Depends(get_current_user)):
+def premium_required(current_user: Principal = Depends(get_current_principal)):
     if not current_user.is_premium:
         raise HTTPException(status_code=403, detail="Premium only")
     return current_user
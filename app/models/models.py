@@ -8,6 +8,9 @@ from sqlalchemy import (
     ForeignKey,
     DateTime,
     CheckConstraint,
+    Index,
+    LargeBinary,
+    UniqueConstraint,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -24,6 +27,7 @@ class User(Base):
     password = Column(String)  # Store hashed password
     is_premium = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
+    is_admin = Column(Boolean, default=False, server_default="0", nullable=False)  # Granted the users:admin scope
     reward = Column(Integer, default=0)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -41,6 +45,7 @@ class User(Base):
     stars = Column(Integer, default=0)  # Total stars earned
     free_chat = Column(Integer, default=3)  # Free chat count
     last_chat_date = Column(DateTime, default=None)  # Track last chat date to reset daily limit
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)  # Bumped to revoke issued tokens
 
     # Relationships
     posts = relationship("Post", back_populates="author")
@@ -58,7 +63,7 @@ class Group(Base):
     __tablename__ = "group"
 
     id = Column(Integer, primary_key=True)
-    name = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False, index=True)
     description = Column(Text)
     code = Column(String(255), nullable=True)
 
@@ -77,7 +82,7 @@ class SubGroup(Base):
 
     id = Column(Integer, primary_key=True)
     group_id = Column(
-        Integer, ForeignKey("group.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("group.id", ondelete="CASCADE"), nullable=False, index=True
     )
     name = Column(String(255), nullable=False)
     description = Column(Text)
@@ -109,6 +114,9 @@ class SituationGroup(Base):
 
 class SituationalQuestion(Base):
     __tablename__ = "situational_question"
+    __table_args__ = (
+        Index("ix_situational_question_group_level", "situation_group_id", "level"),
+    )
 
     id = Column(Integer, primary_key=True)
     content = Column(Text, nullable=False)
@@ -135,6 +143,7 @@ class SituationalAnswer(Base):
         Integer,
         ForeignKey("situational_question.id", ondelete="CASCADE"),
         nullable=False,
+        index=True,
     )
     content = Column(Text, nullable=False)
     is_correct = Column(Boolean, default=False)
@@ -150,6 +159,9 @@ class SituationalAnswer(Base):
 
 class UserSituationalProgress(Base):
     __tablename__ = "user_situational_progress"
+    __table_args__ = (
+        Index("ix_user_situational_progress_user_question", "user_id", "question_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -176,9 +188,9 @@ class Post(Base):
     content = Column(Text)
     audio = Column(Text)
     image = Column(Text)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
     author_id = Column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
 
     # Relationship
@@ -197,7 +209,7 @@ class Test(Base):
     id = Column(Integer, primary_key=True)
     content = Column(Text, nullable=False)
     order = Column(Integer)
-    group_id = Column(Integer, ForeignKey("group.id"), nullable=False)
+    group_id = Column(Integer, ForeignKey("group.id"), nullable=False, index=True)
     code = Column(String(255), nullable=True)
 
     group = relationship("Group", back_populates="tests")
@@ -216,14 +228,17 @@ class TestAnswer(Base):
     __tablename__ = "test_answer"
 
     id = Column(Integer, primary_key=True)
-    test_id = Column(Integer, ForeignKey("test.id", ondelete="CASCADE"), nullable=False)
-    option_id = Column(Integer, ForeignKey("option.id", ondelete="CASCADE"), nullable=False)
+    # Nullable: answers submitted before submissions were linked to users have none
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
+    attempt_id = Column(Integer, ForeignKey("test_attempt.id", ondelete="CASCADE"), nullable=True, index=True)
+    test_id = Column(Integer, ForeignKey("test.id", ondelete="CASCADE"), nullable=False, index=True)
+    option_id = Column(Integer, ForeignKey("option.id", ondelete="CASCADE"), nullable=False, index=True)
 
     test = relationship("Test", back_populates="answers")
     option = relationship("Option")
 
     def __repr__(self):
-        return f"<TestAnswer(id={self.id}, test_id={self.test_id}, option_id={self.option_id})>"
+        return f"<TestAnswer(id={self.id}, attempt_id={self.attempt_id}, test_id={self.test_id}, option_id={self.option_id})>"
 
     def __str__(self):
         return f"TestAnswer: test_id={self.test_id}, option_id={self.option_id}"
@@ -234,10 +249,10 @@ class Entity(Base):
 
     id = Column(Integer, primary_key=True)
     question_id = Column(
-        Integer, ForeignKey("test.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("test.id", ondelete="CASCADE"), nullable=False, index=True
     )
     user_id = Column(
-        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True
     )
     content = Column(Text, nullable=False)
     reward = Column(Integer, default=0)
@@ -256,7 +271,7 @@ class Option(Base):
     __tablename__ = "option"
 
     id = Column(Integer, primary_key=True)
-    test_id = Column(Integer, ForeignKey("test.id", ondelete="CASCADE"), nullable=False)
+    test_id = Column(Integer, ForeignKey("test.id", ondelete="CASCADE"), nullable=False, index=True)
     content = Column(Text, nullable=False)
     level = Column(Integer, nullable=False)
 
@@ -269,16 +284,135 @@ class Option(Base):
         return f"Option: {self.content[:30]}..."
 
 
+class RevokedToken(Base):
+    __tablename__ = "revoked_token"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    expires_at = Column(DateTime, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken(jti='{self.jti}', user_id={self.user_id})>"
+
+    def __str__(self):
+        return f"RevokedToken: {self.jti}"
+
+
+class StarLedger(Base):
+    __tablename__ = "star_ledger"
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    source = Column(String(32), nullable=False)  # attendance, situational, opening
+    amount = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
+
+    def __repr__(self):
+        return f"<StarLedger(id={self.id}, user_id={self.user_id}, source='{self.source}', amount={self.amount})>"
+
+    def __str__(self):
+        return f"StarLedger: user_id={self.user_id}, {self.source} {self.amount:+d}"
+
+
 class SituationalUserAnswer(Base):
     __tablename__ = "situational_user_answer"
+    __table_args__ = (
+        Index("ix_situational_user_answer_user_question", "user_id", "question_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
     question_id = Column(Integer, ForeignKey("situational_question.id", ondelete="CASCADE"), nullable=False)
-    answer_id = Column(Integer, ForeignKey("situational_answer.id", ondelete="CASCADE"), nullable=False)
+    answer_id = Column(Integer, ForeignKey("situational_answer.id", ondelete="CASCADE"), nullable=False, index=True)
 
     def __repr__(self):
         return f"<SituationalUserAnswer(id={self.id}, user_id={self.user_id}, question_id={self.question_id}, answer_id={self.answer_id})>"
 
     def __str__(self):
         return f"SituationalUserAnswer: user_id={self.user_id}, question_id={self.question_id}, answer_id={self.answer_id}"
+
+
+class AppMeta(Base):
+    __tablename__ = "app_meta"
+
+    key = Column(String(64), primary_key=True)
+    value = Column(String, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<AppMeta(key='{self.key}', value='{self.value}')>"
+
+    def __str__(self):
+        return f"AppMeta: {self.key}={self.value}"
+
+
+class TestAttempt(Base):
+    __tablename__ = "test_attempt"
+    __table_args__ = (
+        # History pages: one user's attempts of one type, newest first
+        Index("ix_test_attempt_user_type_finished", "user_id", "test_type", "finished_at", "id"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    test_type = Column(String(8), nullable=False)  # DASS, RADS, MDQ
+    started_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = Column(DateTime, nullable=True)  # None while in progress
+
+    answers = relationship("TestAnswer")
+    result = relationship("TestResult", uselist=False)
+
+    def __repr__(self):
+        return f"<TestAttempt(id={self.id}, user_id={self.user_id}, test_type='{self.test_type}')>"
+
+    def __str__(self):
+        return f"TestAttempt: {self.test_type} #{self.id}"
+
+
+class TestResult(Base):
+    __tablename__ = "test_result"
+    __table_args__ = (
+        Index("ix_test_result_user_type_created", "user_id", "test_type", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    attempt_id = Column(Integer, ForeignKey("test_attempt.id", ondelete="CASCADE"), nullable=True, unique=True)
+    test_type = Column(String(8), nullable=False)  # DASS, RADS, MDQ
+    scores = Column(String, nullable=False)  # JSON string: {"D": 12, "A": 8, "S": 20}
+    bands = Column(String, nullable=False)  # JSON string: {"D": "moderate", ...}
+    answered = Column(Integer, nullable=False)
+    complete = Column(Boolean, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def __repr__(self):
+        return f"<TestResult(id={self.id}, user_id={self.user_id}, test_type='{self.test_type}')>"
+
+    def __str__(self):
+        return f"TestResult: {self.test_type} {self.scores}"
+
+
+class TestDraft(Base):
+    __tablename__ = "test_draft"
+    __table_args__ = (
+        UniqueConstraint("user_id", "test_type", name="uq_test_draft_user_type"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    test_type = Column(String(8), nullable=False)  # DASS, RADS, MDQ
+    # The unfinished attempt the draft becomes on finalize
+    attempt_id = Column(Integer, ForeignKey("test_attempt.id", ondelete="CASCADE"), nullable=False, unique=True)
+    # One byte per item in catalog order: option level + 1, 0 = unanswered
+    levels = Column(LargeBinary, nullable=False)
+    # GET /tests ETag of the catalog the positions refer to; a re-import changes it
+    catalog_etag = Column(String(34), nullable=False, server_default="")
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    attempt = relationship("TestAttempt")
+
+    def __repr__(self):
+        return f"<TestDraft(id={self.id}, user_id={self.user_id}, test_type='{self.test_type}')>"
+
+    def __str__(self):
+        return f"TestDraft: {self.test_type} #{self.id}"
@@ -2,7 +2,8 @@ from fastapi import APIRouter, Depends, status, Security, HTTPException
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.models.models import User
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, invalidate_principal
+from app.services.star_service import StarService, ATTENDANCE
 import datetime
 import json
 from typing import Tuple, List
@@ -86,15 +87,15 @@ def mark_attendance(
     
     # Cập nhật thông tin user
     user.attendances = json.dumps(attendances)
-    user.stars = (user.stars or 0) + stars_to_add
     user.updated_at = today
+    total_stars = StarService.award(db, user.id, stars_to_add, ATTENDANCE)
     db.commit()
-    db.refresh(user)
+    invalidate_principal(current_user.email)
 
     return {
         "message": "Điểm danh thành công!",
         "streak": streak,
         "stars_earned": stars_to_add,
-        "total_stars": user.stars,
+        "total_stars": total_stars,
         "attendances": attendances
     }
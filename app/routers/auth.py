@@ -1,9 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Security
+from fastapi import APIRouter, Depends, HTTPException, status, Security, Request
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.schemas.user import UserLogin, UserCreate, Token
 from app.models.models import User
-from app.core.database import get_db
-from app.core.auth import verify_password, get_password_hash, create_user_token, get_current_user
+from app.core.database import get_async_db, get_db
+from app.core.auth import create_user_token, get_current_user
 from typing import Any
 from sqlalchemy.exc import IntegrityError
 from app.services.auth_service import AuthService
@@ -14,14 +15,16 @@ router = APIRouter(
     tags=["auth"]
 )
 
+# Async so a login waiting on bcrypt holds no threadpool thread
 @router.post("/login")
-def login(user_login: UserLogin, db: Session = Depends(get_db)) -> Any:
-    return AuthService.login(user_login, db)
+async def login(user_login: UserLogin, request: Request, db: AsyncSession = Depends(get_async_db)) -> Any:
+    client_ip = request.client.host if request.client else None
+    return await AuthService.login(user_login, db, client_ip=client_ip)
 
 
 @router.post("/signup")
-def signup(user_create: UserCreate, db: Session = Depends(get_db)) -> Any:
-    return AuthService.signup(user_create, db)
+async def signup(user_create: UserCreate, db: AsyncSession = Depends(get_async_db)) -> Any:
+    return await AuthService.signup(user_create, db)
 
 
 class PasswordChange(BaseModel):
@@ -31,17 +34,28 @@ class PasswordChange(BaseModel):
 
 
 @router.post("/password")
-def change_password(
+async def change_password(
     data: PasswordChange, 
     current_user: User = Security(get_current_user, scopes=["users:read"]),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Change user password.
     
     Requires authentication token with 'users:read' scope.
     """
-    return AuthService.change_password(data.email, data.oldPassword, data.newPassword, db)
+    return await AuthService.change_password(data.email, data.oldPassword, data.newPassword, db)
+
+
+@router.post("/logout-all")
+def logout_all(
+    current_user: User = Security(get_current_user, scopes=["users:read"]),
+    db: Session = Depends(get_db)
+):
+    """
+    Revoke every access and refresh token issued to the current user.
+    """
+    return AuthService.logout_all(current_user, db)
 
 
 class RefreshTokenRequest(BaseModel):
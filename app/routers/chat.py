@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Security
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any, Optional
 from pydantic import BaseModel
 
-from app.core.database import get_db
-from app.core.auth import get_current_user
+from app.core.database import get_async_db
+from app.core.auth import get_current_user, get_current_principal, invalidate_principal, Principal
 from app.models.models import User
 from app.services.chat_service import send_chat_message, use_chat_credit, get_remaining_chats
 
@@ -20,7 +20,7 @@ class ChatMessage(BaseModel):
 @router.post("/send")
 async def send_chat(
         chat_message: ChatMessage,
-        db: Session = Depends(get_db),
+        db: AsyncSession = Depends(get_async_db),
         current_user: User = Security(get_current_user, scopes=["users:read"])
 ) -> Dict[str, Any]:
     """
@@ -29,19 +29,17 @@ async def send_chat(
     - Returns the AI's response
     """
     # Đảm bảo user nằm trong session hiện tại
-    user = db.merge(current_user)
-    db.refresh(user)
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
 
     # Deduct chat credit
-    if not use_chat_credit(user, db):
+    if not await use_chat_credit(user, db):
         raise HTTPException(
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
             detail="Daily chat limit reached. Please try again tomorrow or upgrade to premium for unlimited chats."
         )
 
-    # Sau khi trừ, refresh lại user
-    db.refresh(user)
-
     try:
         # Send message to external chat API
         response = await send_chat_message(chat_message.message)
@@ -59,15 +57,15 @@ async def send_chat(
     except HTTPException as e:
         # Nếu gọi API lỗi → hoàn lại 1 credit
         user.free_chat += 1
-        db.commit()
-        db.refresh(user)
+        await db.commit()
+        invalidate_principal(user.email)
         raise e
 
 
 @router.get("/status")
 async def get_chat_status(
-        db: Session = Depends(get_db),
-        current_user: User = Security(get_current_user, scopes=["users:read"])
+        db: AsyncSession = Depends(get_async_db),
+        current_user: Principal = Security(get_current_principal, scopes=["users:read"])
 ) -> Dict[str, Any]:
     """
     Get the current chat status for the user.
@@ -75,10 +73,11 @@ async def get_chat_status(
     """
 
     # Luôn reload user từ DB để dữ liệu chính xác
-    user = db.merge(current_user)
-    db.refresh(user)
+    user = await db.get(User, current_user.id)
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
 
-    status = get_remaining_chats(user, db)
+    status = await get_remaining_chats(user, db)
 
     return {
         "remaining_chats": status["remaining_chats"],
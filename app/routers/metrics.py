@@ -0,0 +1,37 @@
+from fastapi import APIRouter
+from typing import Any, Dict
+
+from app.core.auth import principal_cache, token_cache, password_hash_pool
+from app.core import database
+from app.core.database import pool_metrics
+from app.core.invalidation import invalidation_bus
+from app.core.maintenance import maintenance_state
+from app.core.rate_limit import login_rate_limiter
+from app.core.revocation import refresh_token_revocations
+from app.core.warmup import warmup_state
+from app.services.catalog_service import test_catalog
+from app.services.situational_service import situational_cache
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+
+@router.get("/")
+def get_metrics() -> Dict[str, Any]:
+    """
+    In-process counters for this worker.
+
+    Requires authentication token with 'users:admin' scope.
+    """
+    return {
+        "principal_cache": principal_cache.stats(),
+        "token_cache": token_cache.stats(),
+        "password_hashing": password_hash_pool.stats(),
+        "refresh_token_revocations": refresh_token_revocations.stats(),
+        "login_rate_limit": login_rate_limiter.stats(),
+        "db_pool": pool_metrics.stats(database.engine.pool),
+        "invalidation_bus": invalidation_bus.stats(),
+        "warmup": warmup_state.stats(),
+        "maintenance": maintenance_state.stats(),
+        "test_catalog": test_catalog.stats(),
+        "situational_cache": situational_cache.stats(),
+    }
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, Query, Security
 from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, get_read_db
+from app.core.warmup import warmup
 from app.models.models import Post, User
 
 router = APIRouter(prefix="/post", tags=["post"])
@@ -9,7 +9,7 @@ router = APIRouter(prefix="/post", tags=["post"])
 @router.get("/")
 def get_posts(
     page: int = Query(1, description="Page number", ge=1),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Security(get_current_user, scopes=["users:read"])
 ):
     page_size = 10
@@ -31,4 +31,9 @@ def get_posts(
         }
         for p in posts
     ]
-    return {"post": post_list, "maxPage": max_page}
\ No newline at end of file
+    return {"post": post_list, "maxPage": max_page}
+
+
+@warmup("posts")
+def warm_posts(db: Session) -> None:
+    get_posts(page=1, db=db, current_user=None)
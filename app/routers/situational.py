@@ -1,8 +1,10 @@
 from fastapi import APIRouter, Depends, Query, Security
 from sqlalchemy.orm import Session
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, get_read_db
 from app.core.database import get_db
-from app.models.models import User
+from app.core.query_budget import statement_budget
+from app.core.warmup import warmup
+from app.models.models import SituationalQuestion, User
 from app.services.situational_service import SituationalService
 from typing import List
 from pydantic import BaseModel
@@ -10,10 +12,10 @@ from pydantic import BaseModel
 router = APIRouter(prefix="/situational", tags=["situational"])
 
 
-@router.get("/progress")
+@router.get("/progress", dependencies=[Depends(statement_budget(2000))])
 def get_progress(
     group: int = Query(..., description="Group id"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Security(get_current_user, scopes=["users:read"]),
 ):
     return SituationalService.get_progress(group, db, current_user)
@@ -23,7 +25,7 @@ def get_progress(
 def get_situational_questions(
     group: int = Query(..., description="Group id"),
     level: int = Query(..., description="Level"),
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_user: User = Security(get_current_user, scopes=["users:read"]),
 ):
     """
@@ -34,6 +36,13 @@ def get_situational_questions(
     return SituationalService.get_situational_questions(group, level, db, current_user)
 
 
+@warmup("situational")
+def warm_situational(db: Session) -> None:
+    levels = db.query(SituationalQuestion.situation_group_id, SituationalQuestion.level).distinct().all()
+    for group, level in levels:
+        SituationalService.get_situational_questions(group, level, db, None)
+
+
 class UserAnswerIn(BaseModel):
     situationalId: str
     answerId: str
@@ -46,4 +55,4 @@ def submit_situational_answers(
     current_user: User = Security(get_current_user, scopes=["users:read"]),
 ):
     answer_dicts = [a.dict() for a in answers]
-    return SituationalService.submit_situational_answers(answer_dicts, current_user.id, db)
+    return SituationalService.submit_situational_answers(answer_dicts, current_user, db)
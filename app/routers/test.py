@@ -1,15 +1,21 @@
-from fastapi import APIRouter, Depends, Query, HTTPException, status, Security
+from fastapi import APIRouter, Depends, Query, HTTPException, Request, Response, status, Security
 from sqlalchemy.orm import Session
-from typing import List, Literal
+from typing import List, Literal, Optional
 from pydantic import BaseModel
 from app.core.database import get_db
 from app.models.models import Test, Entity, Group
 from app.models.models import TestAnswer, User
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, get_read_db
+from app.core.warmup import warmup
+from app.services.catalog_service import etag_matches, test_catalog
+from app.services.draft_service import DraftAnswerIn, DraftService
+from app.services.test_service import TestService
 from app.models.models import Test, Option, Group
 
 router = APIRouter(prefix="/tests", tags=["tests"])
 
+TestType = Literal["RADS", "DASS", "MDQ"]
+
 
 class OptionOut(BaseModel):
     id: str
@@ -30,42 +36,38 @@ class GroupedTestOut(BaseModel):
 
 @router.get("/", response_model=List[GroupedTestOut])
 def get_tests(
-    type: Literal["RADS", "DASS", "MDQ"] = Query(..., description="Test type"),
-    db: Session = Depends(get_db),
+    request: Request,
+    type: TestType = Query(..., description="Test type"),
+    db: Session = Depends(get_read_db),
+    current_user: User = Security(get_current_user, scopes=["users:read"]),
+):
+    # Served from the precomputed catalog; the bytes already match response_model
+    entry = test_catalog.get(type, db)
+    headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+@router.get("/history")
+def get_test_history(
+    type: TestType = Query(..., description="Test type"),
+    limit: int = Query(10, ge=1, le=50, description="Page size"),
+    cursor: Optional[str] = Query(None, description="nextCursor from the previous page"),
+    db: Session = Depends(get_read_db),
     current_user: User = Security(get_current_user, scopes=["users:read"]),
 ):
-    group = db.query(Group).filter(Group.name == type).first()
-    if not group:
-        return []
-    tests = db.query(Test).filter(Test.group_id == group.id).all()
-    if not tests:
-        return []
-
-    if type == "DASS":
-        # Nhóm theo code (A, S, D)
-        code_map = {}
-        for test in tests:
-            code = test.code or "Khác"
-            options = db.query(Option).filter(Option.test_id == test.id).all()
-            option_list = [
-                OptionOut(id=str(option.id), content=option.content, level=option.level)
-                for option in options
-            ]
-            test_out = TestOut(id=str(test.id), content=test.content, options=option_list)
-            code_map.setdefault(code, []).append(test_out)
-        return [GroupedTestOut(group=code, test=test_list) for code, test_list in code_map.items()]
-    else:
-        test_list = []
-        for test in tests:
-            options = db.query(Option).filter(Option.test_id == test.id).all()
-            option_list = [
-                OptionOut(id=str(option.id), content=option.content, level=option.level)
-                for option in options
-            ]
-            test_list.append(
-                TestOut(id=str(test.id), content=test.content, options=option_list)
-            )
-        return [GroupedTestOut(group=type, test=test_list)]
+    """
+    Finished attempts of one test type with their scores, newest first.
+
+    Requires authentication token with 'users:read' scope.
+    """
+    return TestService.get_history(current_user.id, type, limit, cursor, db)
+
+
+@warmup("tests")
+def warm_tests(db: Session) -> None:
+    test_catalog.build(db)
 
 
 class TestAnswerIn(BaseModel):
@@ -79,10 +81,53 @@ def submit_test_answers(
     db: Session = Depends(get_db),
     current_user: User = Security(get_current_user, scopes=["users:read"]),
 ):
-    saved_answers = []
-    for ans in answers:
-        answer = TestAnswer(test_id=int(ans.testId), option_id=ans.optionId)
-        db.add(answer)
-        saved_answers.append({"testId": ans.testId, "optionId": ans.optionId})
-    db.commit()
-    return {"status": "success", "saved": saved_answers}
+    return TestService.submit_test_answers(answers, current_user, db)
+
+
+@router.get("/drafts/{type}")
+def get_test_draft(
+    type: TestType,
+    db: Session = Depends(get_db),
+    current_user: User = Security(get_current_user, scopes=["users:read"]),
+):
+    """
+    Resume a partially answered test: the saved answers of the user's draft.
+
+    Read from the primary so a resume always sees the latest autosave.
+    409 when the test was re-imported after the draft was saved.
+    """
+    return DraftService.get(type, current_user, db)
+
+
+@router.patch("/drafts/{type}")
+def save_test_draft(
+    type: TestType,
+    changes: List[DraftAnswerIn],
+    db: Session = Depends(get_db),
+    current_user: User = Security(get_current_user, scopes=["users:read"]),
+):
+    """
+    Autosave: send only the items changed since the last save
+    (optionId null clears an item). Creates the draft on first use, and
+    starts it over if the test was re-imported since the last save.
+    """
+    return DraftService.save(type, changes, current_user, db)
+
+
+@router.post("/drafts/{type}/finalize")
+def finalize_test_draft(
+    type: TestType,
+    db: Session = Depends(get_db),
+    current_user: User = Security(get_current_user, scopes=["users:read"]),
+):
+    """Store the draft as a finished attempt with its answers and scores."""
+    return DraftService.finalize(type, current_user, db)
+
+
+@router.delete("/drafts/{type}", status_code=status.HTTP_204_NO_CONTENT)
+def discard_test_draft(
+    type: TestType,
+    db: Session = Depends(get_db),
+    current_user: User = Security(get_current_user, scopes=["users:read"]),
+):
+    DraftService.discard(type, current_user, db)
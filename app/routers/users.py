@@ -1,16 +1,26 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Security, Form
+from fastapi import APIRouter, Depends, HTTPException, status, Security, Form, UploadFile, File, Query
 from sqlalchemy.orm import Session
-from typing import List
-from app.core.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Literal, Optional
+from app.core.database import get_db, get_async_db
 from app.core.auth import (
     get_password_hash,
     verify_password,
     create_user_token,
     get_current_user,
     get_current_active_user,
-    ACCESS_TOKEN_EXPIRE_MINUTES
+    get_current_principal,
+    invalidate_principal,
+    mark_tokens_revoked,
+    revoke_user_tokens,
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    Principal
 )
+from app.core.config import settings
+from app.core.query_budget import statement_budget
 from app.models.models import User
+from app.services.auth_service import AuthService
+from app.services.provisioning_service import ProvisioningService
 from app.schemas.user import UserCreate, UserUpdate, User as UserSchema, Token, UserLogin
 from datetime import timedelta
 import json
@@ -77,17 +87,29 @@ def update_user(
         user.dob = user_update.dob
     if user_update.image is not None:
         user.image = user_update.image
+    premium_changed = (
+        user_update.isPremium is not None and user_update.isPremium != user.is_premium
+    )
     if user_update.isPremium is not None:
         user.is_premium = user_update.isPremium
-    db.commit()
-    db.refresh(user)
-    return {
+    if premium_changed:
+        # Claims-only tokens still carry the old flag: revoke them in the same
+        # commit and hand the caller a fresh pair, as change_password does
+        revoke_user_tokens(user, db)
+    else:
+        db.commit()
+        invalidate_principal(user.email)
+    response = {
         "id": user.id,
         "displayName": user.display_name,
         "dob": user.dob,
         "image": user.image,
         "isPremium": user.is_premium
     }
+    if premium_changed:
+        response["accessToken"] = create_user_token(user)["access_token"]
+        response["refreshToken"] = AuthService.create_refresh_token(user)
+    return response
 
 
 @router.delete(
@@ -101,7 +123,7 @@ def update_user(
 )
 async def delete_user(
         current_user: User = Security(get_current_user, scopes=["users:read"]),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_async_db)
 ):
     """
     Delete current user's information.
@@ -109,11 +131,58 @@ async def delete_user(
     Requires authentication token with 'users:read' scope.
     """
     
-    db_user = db.query(User).filter(User.id == current_user.id).first()
+    db_user = await db.get(User, current_user.id)
     if db_user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    db.delete(db_user)
-    db.commit()
+    user_id, email, token_version = db_user.id, db_user.email, db_user.token_version or 0
+    await db.delete(db_user)
+    await db.commit()
+    mark_tokens_revoked(user_id, token_version + 1)
+    invalidate_principal(email)
     return {"message": "User deleted successfully"}
 
+
+# Upload size allowance per row for POST /users/bulk; real rows are far smaller
+MAX_BYTES_PER_ROW = 1024
+
+
+@router.post(
+    "/bulk",
+    dependencies=[Depends(statement_budget(60000))],
+    responses={
+        200: {"description": "Per-row provisioning status"},
+        403: {"description": "Not enough permissions"},
+        413: {"description": "More rows (or bytes) than BULK_PROVISION_MAX_ROWS allows"},
+    }
+)
+def bulk_create_users(
+    file: UploadFile = File(..., description="CSV (with header) or NDJSON of accounts"),
+    format: Optional[Literal["csv", "ndjson"]] = Query(None, description="Defaults to the file extension"),
+    db: Session = Depends(get_db),
+    current_user: Principal = Security(get_current_principal, scopes=["users:admin"]),
+):
+    """
+    Provision many accounts at once, e.g. a whole class.
+
+    Requires authentication token with 'users:admin' scope. At most
+    BULK_PROVISION_MAX_ROWS rows per upload; use app.scripts.provision_users
+    for larger imports.
+    """
+    fmt = format or ("csv" if (file.filename or "").lower().endswith(".csv") else "ndjson")
+    too_large = HTTPException(
+        status_code=413,
+        detail=f"At most {settings.BULK_PROVISION_MAX_ROWS} rows per upload; use the provision_users script for more",
+    )
+    # Don't load an arbitrarily large upload just to count its rows
+    max_bytes = settings.BULK_PROVISION_MAX_ROWS * MAX_BYTES_PER_ROW
+    raw = file.file.read(max_bytes + 1)
+    if len(raw) > max_bytes:
+        raise too_large
+    try:
+        rows = ProvisioningService.parse_rows(raw.decode("utf-8-sig"), fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if len(rows) > settings.BULK_PROVISION_MAX_ROWS:
+        raise too_large
+    return ProvisioningService.provision(rows, db)
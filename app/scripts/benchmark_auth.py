@@ -0,0 +1,43 @@
+"""
+Compare per-request token verification cost with and without the JWT cache.
+
+    python -m app.scripts.benchmark_auth --requests 20000
+"""
+import argparse
+import time
+from datetime import timedelta
+
+from fastapi.security import SecurityScopes
+
+from app.core.auth import _decode_token, create_access_token, token_cache
+
+
+def run(token: str, requests: int, cached: bool) -> float:
+    scopes = SecurityScopes(scopes=["users:read"])
+    token_cache.clear()
+    start = time.perf_counter()
+    for _ in range(requests):
+        if not cached:
+            token_cache.clear()
+        _decode_token(token, scopes)
+    return (time.perf_counter() - start) / requests * 1_000_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    token = create_access_token(
+        {"sub": "bench@example.com", "scopes": ["users:read", "users:write"]},
+        expires_delta=timedelta(minutes=60),
+    )
+    uncached_us = run(token, args.requests, cached=False)
+    cached_us = run(token, args.requests, cached=True)
+    print(f"uncached: {uncached_us:8.1f} us/request")
+    print(f"cached:   {cached_us:8.1f} us/request")
+    print(f"speedup:  {uncached_us / cached_us:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Compare GET /tests before and after the precomputed catalog.
+
+"before" is the old handler: group lookup, one Option query per test,
+OptionOut/TestOut objects, then response_model validation and JSON
+rendering. "after" is the catalog lookup plus the 200 body, and the 304
+path for a matching If-None-Match. Both are measured as bare handlers and
+as HTTP requests through a FastAPI app (no auth). Reports per-request
+latency and the memory allocated per request (tracemalloc), and checks
+that both produce the same bytes.
+
+Uses a temporary SQLite database filled by the docx import.
+
+    python -m app.scripts.benchmark_catalog --requests 200
+"""
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import List
+
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from pydantic import TypeAdapter
+
+from app.models.models import Group, Option, Test
+from app.routers.test import GroupedTestOut, OptionOut, TestOut
+from app.scripts.fixtures import seeded_catalog
+from app.services.catalog_service import TEST_TYPES, TestCatalog, etag_matches
+
+response_adapter = TypeAdapter(List[GroupedTestOut])
+
+
+def legacy_result(type: str, db) -> list:
+    group = db.query(Group).filter(Group.name == type).first()
+    if not group:
+        result = []
+    else:
+        tests = db.query(Test).filter(Test.group_id == group.id).all()
+        if type == "DASS":
+            code_map = {}
+            for test in tests:
+                options = db.query(Option).filter(Option.test_id == test.id).all()
+                option_list = [OptionOut(id=str(o.id), content=o.content, level=o.level) for o in options]
+                code_map.setdefault(test.code or "Khác", []).append(
+                    TestOut(id=str(test.id), content=test.content, options=option_list)
+                )
+            result = [GroupedTestOut(group=code, test=test_list) for code, test_list in code_map.items()]
+        else:
+            test_list = []
+            for test in tests:
+                options = db.query(Option).filter(Option.test_id == test.id).all()
+                option_list = [OptionOut(id=str(o.id), content=o.content, level=o.level) for o in options]
+                test_list.append(TestOut(id=str(test.id), content=test.content, options=option_list))
+            result = [GroupedTestOut(group=type, test=test_list)]
+    return result
+
+
+def legacy_get_tests(type: str, db) -> bytes:
+    # What response_model does with the return value
+    validated = response_adapter.validate_python(legacy_result(type, db), from_attributes=True)
+    return JSONResponse(response_adapter.dump_python(validated, mode="json")).body
+
+
+def measure(fn, requests: int):
+    fn()
+    latencies = []
+    for _ in range(requests):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    tracemalloc.start()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    latencies.sort()
+    return statistics.mean(latencies), latencies[int(len(latencies) * 0.99) - 1], peak
+
+
+def bench_app(catalog: TestCatalog, Session) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/before", response_model=List[GroupedTestOut])
+    def before(type: str):
+        with Session() as db:
+            return legacy_result(type, db)
+
+    @app.get("/after", response_model=List[GroupedTestOut])
+    def after(request: Request, type: str):
+        with Session() as db:
+            entry = catalog.get(type, db)
+        headers = {"ETag": entry.etag, "Cache-Control": "private, no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), entry.etag):
+            return Response(status_code=304, headers=headers)
+        return Response(content=entry.body, media_type="application/json", headers=headers)
+
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    with seeded_catalog() as Session:
+        catalog = TestCatalog()
+        mismatches = 0
+        print(f"{'type':6} {'path':8} {'mean ms':>9} {'p99 ms':>9} {'alloc KiB':>10}")
+        with Session() as db:
+            for test_type in TEST_TYPES:
+                entry = catalog.get(test_type, db)
+                if legacy_get_tests(test_type, db) != entry.body:
+                    mismatches += 1
+                    print(f"{test_type}: catalog body differs from the old handler")
+
+                def after_200():
+                    entry = catalog.get(test_type, db)
+                    etag_matches(None, entry.etag)
+                    return entry.body
+
+                def after_304():
+                    entry = catalog.get(test_type, db)
+                    return etag_matches(entry.etag, entry.etag)
+
+                for name, fn in (
+                    ("before", lambda: legacy_get_tests(test_type, db)),
+                    ("after", after_200),
+                    ("304", after_304),
+                ):
+                    mean, p99, peak = measure(fn, args.requests)
+                    print(f"{test_type:6} {name:8} {mean:9.3f} {p99:9.3f} {peak / 1024:10.1f}")
+            start = time.perf_counter()
+            catalog.build(db)
+            print(f"full rebuild (all types, one pass): {(time.perf_counter() - start) * 1000:.1f} ms")
+
+        print("\nHTTP, through FastAPI")
+        client = TestClient(bench_app(catalog, Session))
+        for test_type in TEST_TYPES:
+            etag = catalog.get(test_type, None).etag
+            for name, fn in (
+                ("before", lambda: client.get("/before", params={"type": test_type})),
+                ("after", lambda: client.get("/after", params={"type": test_type})),
+                ("304", lambda: client.get("/after", params={"type": test_type}, headers={"If-None-Match": etag})),
+            ):
+                mean, p99, peak = measure(fn, args.requests)
+                print(f"{test_type:6} {name:8} {mean:9.3f} {p99:9.3f} {peak / 1024:10.1f}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
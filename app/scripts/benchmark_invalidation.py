@@ -0,0 +1,92 @@
+"""
+Measure how long a cache invalidation takes to reach other worker processes.
+
+Starts N subscriber processes, each with its own InvalidationBus, publishes
+messages from this process and reports the delivery latency seen by the
+subscribers. The sqlite backend uses a temporary file; postgres uses the
+configured DATABASE_URL.
+
+    python -m app.scripts.benchmark_invalidation --backend sqlite --workers 4
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import tempfile
+import time
+
+
+def _make_bus(backend: str, sqlite_path: str, poll_ms: int):
+    from app.core.invalidation import (
+        InvalidationBus,
+        PostgresInvalidationBackend,
+        SQLiteInvalidationBackend,
+    )
+    from app.core.config import settings
+
+    if backend == "postgres":
+        return InvalidationBus(PostgresInvalidationBackend(settings.get_database_url(), channel="cache_invalidation_bench"))
+    return InvalidationBus(SQLiteInvalidationBackend(sqlite_path, poll_ms / 1000))
+
+
+def subscriber(backend: str, sqlite_path: str, poll_ms: int, ready, results) -> None:
+    bus = _make_bus(backend, sqlite_path, poll_ms)
+    bus.subscribe("bench", lambda key: results.put((os.getpid(), key, time.time())))
+    bus.start()
+    ready.set()
+    while True:
+        time.sleep(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=["sqlite", "postgres"], default="sqlite")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--messages", type=int, default=50)
+    parser.add_argument("--poll-ms", type=int, default=200, help="SQLite poll interval")
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_path = os.path.join(tmp, "invalidation.db")
+        bus = _make_bus(args.backend, sqlite_path, args.poll_ms)
+        bus.publish("bench", "warmup")  # creates the table before subscribers read it
+        results = ctx.Queue()
+        procs = []
+        for _ in range(args.workers):
+            ready = ctx.Event()
+            proc = ctx.Process(target=subscriber, args=(args.backend, sqlite_path, args.poll_ms, ready, results), daemon=True)
+            proc.start()
+            ready.wait(30)
+            procs.append(proc)
+
+        sent = {}
+        for i in range(args.messages):
+            key = str(i)
+            sent[key] = time.time()
+            bus.publish("bench", key)
+            time.sleep(0.02)
+
+        latencies = []
+        expected = args.messages * args.workers
+        deadline = time.time() + 10
+        while len(latencies) < expected and time.time() < deadline:
+            try:
+                _, key, received = results.get(timeout=1)
+            except queue.Empty:
+                continue
+            if key in sent:
+                latencies.append((received - sent[key]) * 1000)
+        for proc in procs:
+            proc.terminate()
+
+    latencies.sort()
+    print(f"backend: {args.backend}, workers: {args.workers}, delivered {len(latencies)}/{expected}")
+    if latencies:
+        print(f"latency ms  p50: {latencies[len(latencies) // 2]:7.1f}  "
+              f"p99: {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]:7.1f}  "
+              f"max: {latencies[-1]:7.1f}")
+
+
+if __name__ == "__main__":
+    main()
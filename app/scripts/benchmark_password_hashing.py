@@ -0,0 +1,56 @@
+"""
+Measure bcrypt verify latency at several cost factors.
+
+Pick BCRYPT_ROUNDS from the numbers this prints instead of guessing:
+
+    python -m app.scripts.benchmark_password_hashing --rounds 10 11 12 13 --samples 50
+"""
+import argparse
+import os
+import statistics
+import time
+
+from passlib.hash import bcrypt
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def benchmark(rounds: int, samples: int, password: str = "password123") -> dict:
+    handler = bcrypt.using(rounds=rounds)
+    hashed = handler.hash(password)
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        handler.verify(password, hashed)
+        timings.append((time.perf_counter() - start) * 1000)
+    mean_ms = statistics.mean(timings)
+    return {
+        "rounds": rounds,
+        "p50_ms": percentile(timings, 0.50),
+        "p99_ms": percentile(timings, 0.99),
+        "logins_per_sec_per_core": 1000 / mean_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--samples", type=int, default=30)
+    args = parser.parse_args()
+
+    cores = os.cpu_count() or 1
+    print(f"{'rounds':>6} {'p50 ms':>9} {'p99 ms':>9} {'logins/s/core':>14} {'logins/s (' + str(cores) + ' cores)':>20}")
+    for rounds in args.rounds:
+        result = benchmark(rounds, args.samples)
+        per_core = result["logins_per_sec_per_core"]
+        print(
+            f"{result['rounds']:>6} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f} "
+            f"{per_core:>14.1f} {per_core * cores:>20.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measure SQLite reader/writer throughput with the default connection settings
+and with the tuned pragmas from Settings (WAL, busy_timeout, ...).
+
+Each profile runs against a fresh temporary database file. Writers insert
+rows in small transactions while readers fetch the newest ones.
+
+    python -m app.scripts.benchmark_sqlite --readers 8 --writers 4 --seconds 5
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from sqlalchemy import create_engine, exc, text
+
+from app.core.database import install_sqlite_pragmas, sqlite_pragmas
+
+
+def run(pragmas, readers: int, writers: int, seconds: float):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(
+            f"sqlite:///{os.path.join(tmp, 'bench.db')}",
+            pool_size=readers + writers,
+        )
+        if pragmas is not None:
+            install_sqlite_pragmas(engine, pragmas)
+        with engine.begin() as conn:
+            conn.execute(text("CREATE TABLE answer (id INTEGER PRIMARY KEY, user_id INTEGER, payload TEXT)"))
+
+        counts = {"reads": 0, "writes": 0, "locked": 0}
+        lock = threading.Lock()
+        deadline = time.perf_counter() + seconds
+
+        def bump(key):
+            with lock:
+                counts[key] += 1
+
+        def writer(n):
+            while time.perf_counter() < deadline:
+                try:
+                    with engine.begin() as conn:
+                        conn.execute(
+                            text("INSERT INTO answer (user_id, payload) VALUES (:u, :p)"),
+                            [{"u": n, "p": "x" * 64} for _ in range(10)],
+                        )
+                    bump("writes")
+                except exc.OperationalError:
+                    bump("locked")
+
+        def reader():
+            while time.perf_counter() < deadline:
+                try:
+                    with engine.connect() as conn:
+                        conn.execute(text("SELECT payload FROM answer ORDER BY id DESC LIMIT 10")).all()
+                    bump("reads")
+                except exc.OperationalError:
+                    bump("locked")
+
+        threads = [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+        threads += [threading.Thread(target=reader) for _ in range(readers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        engine.dispose()
+    return {k: v / seconds if k != "locked" else v for k, v in counts.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    for name, pragmas in (("default", None), ("tuned", sqlite_pragmas())):
+        result = run(pragmas, args.readers, args.writers, args.seconds)
+        print(f"{name:8} reads/s: {result['reads']:9.1f}  write txns/s: {result['writes']:8.1f}  "
+              f"locked errors: {result['locked']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Compare autosaving a RADS test by resending the whole answer list with the
+draft endpoint's deltas.
+
+A user answers the 30 RADS items one at a time and the client saves after
+every answer. "resend" posts the full list so far each time and the server
+replaces the stored answers (delete + one multi-row INSERT); "draft" sends
+the one changed item to DraftService.save, which rewrites a single packed
+row. Reports request bytes, rows changed (sqlite3 total_changes) and save
+latency, then checks that finalizing the draft scores the same as a full
+POST /tests.
+
+Uses a temporary SQLite database filled by the docx import.
+
+    python -m app.scripts.benchmark_test_drafts --users 20
+"""
+import argparse
+import json
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import delete, insert
+
+from app.models.models import Group, Test, TestAnswer, User
+from app.scripts.fixtures import seeded_catalog
+from app.services.catalog_service import test_catalog
+from app.services.draft_service import DraftAnswerIn, DraftService
+from app.services.test_service import TestAnswerIn, TestService
+
+TEST_TYPE = "RADS"
+
+
+def body_size(answers) -> int:
+    return len(json.dumps(answers, separators=(",", ":")).encode())
+
+
+def resend_save(answers, user, db) -> None:
+    # What a whole-list autosave has to do on the server
+    db.execute(delete(TestAnswer).where(TestAnswer.user_id == user.id, TestAnswer.attempt_id.is_(None)))
+    db.execute(insert(TestAnswer).values([
+        {"user_id": user.id, "test_id": int(ans["testId"]), "option_id": int(ans["optionId"])} for ans in answers
+    ]))
+    db.commit()
+
+
+def changes(db) -> int:
+    return db.connection().connection.driver_connection.total_changes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="Users taking the test, one after another")
+    args = parser.parse_args()
+
+    with seeded_catalog("drafts.db") as Session:
+        with Session() as db:
+            tests = db.query(Test).join(Group).filter(Group.name == TEST_TYPE).order_by(Test.id).all()
+            picks = [
+                {"testId": str(test.id), "optionId": str(sorted(test.options, key=lambda o: o.id)[i % 4].id)}
+                for i, test in enumerate(tests)
+            ]
+            for i in range(args.users):
+                db.add(User(email=f"bench{i}@example.com", password="x"))
+            db.commit()
+            users = [SimpleNamespace(id=user_id) for (user_id,) in db.query(User.id).all()]
+            test_catalog.index(db)
+
+        print(f"{len(picks)} {TEST_TYPE} items, one save per answer, {len(users)} users")
+        print(f"{'path':8} {'bytes/test':>11} {'rows/test':>10} {'save ms':>9} {'p99 ms':>8}")
+        for name in ("resend", "draft"):
+            sent = written = 0
+            latencies = []
+            with Session() as db:
+                for user in users:
+                    before = changes(db)
+                    for k in range(1, len(picks) + 1):
+                        if name == "resend":
+                            payload = picks[:k]
+                            start = time.perf_counter()
+                            resend_save(payload, user, db)
+                        else:
+                            payload = [picks[k - 1]]
+                            start = time.perf_counter()
+                            DraftService.save(TEST_TYPE, [DraftAnswerIn(**ans) for ans in payload], user, db)
+                        latencies.append((time.perf_counter() - start) * 1000)
+                        sent += body_size(payload)
+                    written += changes(db) - before
+            latencies.sort()
+            print(f"{name:8} {sent // len(users):>11} {written // len(users):>10} "
+                  f"{statistics.median(latencies):9.3f} {latencies[int(len(latencies) * 0.99) - 1]:8.3f}")
+
+        with Session() as db:
+            finalized = DraftService.finalize(TEST_TYPE, users[0], db)["results"]
+            submitted = TestService.submit_test_answers([TestAnswerIn(**ans) for ans in picks], users[0], db)["results"]
+    strip = [{k: v for k, v in r.items() if k != "attemptId"} for r in finalized]
+    if strip != [{k: v for k, v in r.items() if k != "attemptId"} for r in submitted]:
+        print(f"finalized draft scores differ from a full submission: {finalized} != {submitted}")
+        sys.exit(1)
+    print(f"finalize matches a full submission: {strip}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Show that GET /tests/history costs O(page size) however large test_answer
+grows.
+
+Seeds a temporary SQLite database in stages up to --answers rows (21
+answers per attempt, spread over many users), and after each stage times
+TestService.get_history for one user with a fixed number of attempts: the
+first page and a page deep into the keyset cursor. Also prints the query
+plan, which should search ix_test_attempt_user_type_finished with no
+temporary sort.
+
+    python -m app.scripts.benchmark_test_history --answers 3000000 --stages 3
+"""
+import argparse
+import json
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, install_sqlite_pragmas
+from app.services.test_service import TestService
+
+ANSWERS_PER_ATTEMPT = 21
+TARGET_USER = 1
+TARGET_ATTEMPTS = 500
+SCORES = json.dumps({"D": 12, "A": 8, "S": 20}, separators=(",", ":"))
+BANDS = json.dumps({"D": "mild", "A": "mild", "S": "moderate"}, separators=(",", ":"))
+
+
+def seed(conn: sqlite3.Connection, attempts: int, users: int, start_id: int, clock: datetime, target: int = 0) -> datetime:
+    attempt_rows, result_rows, answer_rows = [], [], []
+    for i in range(attempts):
+        attempt_id = start_id + i
+        user_id = TARGET_USER if i < target else random.randint(2, users)
+        clock += timedelta(seconds=1)
+        attempt_rows.append((attempt_id, user_id, "DASS", clock, clock))
+        result_rows.append((user_id, attempt_id, "DASS", SCORES, BANDS, ANSWERS_PER_ATTEMPT, 1, clock))
+        answer_rows.extend((user_id, attempt_id, t, t * 4) for t in range(1, ANSWERS_PER_ATTEMPT + 1))
+    conn.executemany(
+        "INSERT INTO test_attempt (id, user_id, test_type, started_at, finished_at) VALUES (?, ?, ?, ?, ?)",
+        attempt_rows,
+    )
+    conn.executemany(
+        "INSERT INTO test_result (user_id, attempt_id, test_type, scores, bands, answered, complete, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        result_rows,
+    )
+    conn.executemany(
+        "INSERT INTO test_answer (user_id, attempt_id, test_id, option_id) VALUES (?, ?, ?, ?)", answer_rows
+    )
+    conn.commit()
+    return clock
+
+
+def timed(fn, runs: int = 50) -> float:
+    fn()
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--answers", type=int, default=3_000_000, help="test_answer rows after the last stage")
+    parser.add_argument("--stages", type=int, default=3)
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--limit", type=int, default=10, help="Page size")
+    args = parser.parse_args()
+    random.seed(7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.db")
+        engine = create_engine(f"sqlite:///{path}")
+        install_sqlite_pragmas(engine)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+
+        conn = sqlite3.connect(path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executemany(
+            "INSERT INTO users (id, email, password) VALUES (?, ?, 'x')",
+            [(i, f"user{i}@example.com") for i in range(1, args.users + 1)],
+        )
+        conn.commit()
+
+        total_attempts = args.answers // ANSWERS_PER_ATTEMPT
+        next_id, clock = 1, datetime(2025, 1, 1)
+        print(f"{'answers':>10} {'attempts':>9} {'seed s':>7} {'page 1 ms':>10} {'page 20 ms':>11}")
+        for stage in range(1, args.stages + 1):
+            stage_attempts = total_attempts * stage // args.stages - (next_id - 1)
+            start = time.perf_counter()
+            clock = seed(conn, stage_attempts, args.users, next_id, clock, target=TARGET_ATTEMPTS if stage == 1 else 0)
+            seeded = time.perf_counter() - start
+            next_id += stage_attempts
+
+            with Session() as db:
+                first = TestService.get_history(TARGET_USER, "DASS", args.limit, None, db)
+                cursor = first["nextCursor"]
+                for _ in range(18):
+                    cursor = TestService.get_history(TARGET_USER, "DASS", args.limit, cursor, db)["nextCursor"]
+                first_ms = timed(lambda: TestService.get_history(TARGET_USER, "DASS", args.limit, None, db))
+                deep_ms = timed(lambda: TestService.get_history(TARGET_USER, "DASS", args.limit, cursor, db))
+            answers = conn.execute("SELECT COUNT(*) FROM test_answer").fetchone()[0]
+            print(f"{answers:>10} {next_id - 1:>9} {seeded:>7.1f} {first_ms:>10.3f} {deep_ms:>11.3f}")
+
+        with engine.connect() as sa_conn:
+            plan = sa_conn.execute(text(
+                "EXPLAIN QUERY PLAN SELECT test_attempt.id FROM test_attempt "
+                "JOIN test_result ON test_result.attempt_id = test_attempt.id "
+                "WHERE test_attempt.user_id = 1 AND test_attempt.test_type = 'DASS' "
+                "AND test_attempt.finished_at IS NOT NULL "
+                "ORDER BY test_attempt.finished_at DESC, test_attempt.id DESC LIMIT 11"
+            )).fetchall()
+        print("\nplan:")
+        for row in plan:
+            print(f"  {row[-1]}")
+        conn.close()
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
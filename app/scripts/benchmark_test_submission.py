@@ -0,0 +1,91 @@
+"""
+Measure test-answer submission throughput: 21-item DASS batches posted by
+many users at once.
+
+"before" is the old handler (one ORM object per answer, no validation, no
+user id); "after" is TestService.submit_test_answers (the whole batch
+checked against the catalog's option index, then one multi-row INSERT,
+plus the scored test_result row).
+Uses a temporary SQLite database filled by the docx import.
+
+    python -m app.scripts.benchmark_test_submission --threads 8 --batches 50
+"""
+import argparse
+import threading
+import time
+from types import SimpleNamespace
+
+from sqlalchemy import func
+
+from app.models.models import Group, Test, TestAnswer, User
+from app.scripts.fixtures import seeded_catalog
+from app.services.catalog_service import test_catalog
+from app.services.test_service import TestAnswerIn, TestService
+
+BATCH_SIZE = 21
+
+
+def legacy_submit(answers, user, db) -> None:
+    for ans in answers:
+        db.add(TestAnswer(test_id=int(ans.testId), option_id=ans.optionId))
+    db.commit()
+
+
+def run(submit, Session, users, batch, batches: int) -> float:
+    start_barrier = threading.Barrier(len(users) + 1)
+    errors = []
+
+    def worker(user):
+        start_barrier.wait()
+        for _ in range(batches):
+            with Session() as db:
+                try:
+                    submit(batch, user, db)
+                except Exception as e:
+                    errors.append(e)
+
+    pool = [threading.Thread(target=worker, args=(user,)) for user in users]
+    for t in pool:
+        t.start()
+    start_barrier.wait()
+    start = time.perf_counter()
+    for t in pool:
+        t.join()
+    elapsed = time.perf_counter() - start
+    if errors:
+        print(f"  {len(errors)} errors, first: {errors[0]!r}")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--batches", type=int, default=50, help="Batches per thread")
+    args = parser.parse_args()
+
+    with seeded_catalog("answers.db", pool_size=args.threads) as Session:
+        with Session() as db:
+            tests = (
+                db.query(Test).join(Group).filter(Group.name == "DASS").order_by(Test.id).limit(BATCH_SIZE).all()
+            )
+            batch = [TestAnswerIn(testId=str(test.id), optionId=str(test.options[0].id)) for test in tests]
+            for i in range(args.threads):
+                db.add(User(email=f"bench{i}@example.com", password="x"))
+            db.commit()
+            users = [SimpleNamespace(id=user_id) for (user_id,) in db.query(User.id).all()]
+            test_catalog.option_index(db)
+
+        expected = args.threads * args.batches * BATCH_SIZE
+        for name, submit in (("before", legacy_submit), ("after", TestService.submit_test_answers)):
+            with Session() as db:
+                db.query(TestAnswer).delete()
+                db.commit()
+            elapsed = run(submit, Session, users, batch, args.batches)
+            with Session() as db:
+                rows, linked = db.query(func.count(TestAnswer.id), func.count(TestAnswer.user_id)).one()
+            print(f"{name:7} {rows}/{expected} rows ({linked} with user_id) in {elapsed:.2f}s: "
+                  f"{rows / elapsed:8.0f} rows/s, {rows / BATCH_SIZE / elapsed:6.0f} batches/s")
+
+
+if __name__ == "__main__":
+    main()
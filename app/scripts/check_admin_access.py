@@ -0,0 +1,66 @@
+"""
+Check that the admin-only endpoints (bulk provisioning, metrics) admit
+admins and reject everyone else.
+
+Runs the app in-process against a temporary SQLite database, signs up an
+admin (users.is_admin set) and a regular account, and with each token posts
+the same CSV to POST /users/bulk and reads GET /metrics: the admin must get
+200 (and the accounts created), the regular user 403. Both token styles are
+checked (claims in the token and the users-row lookup).
+
+    python -m app.scripts.check_admin_access
+"""
+import os
+import sys
+
+from app.scripts.fixtures import APP_DB, temporary_app
+
+PASSWORD = "Secret123!"
+
+
+def run(db_path: str) -> int:
+    import sqlite3
+
+    from fastapi.testclient import TestClient
+
+    from app.core.config import settings
+    from app.main import app
+
+    failures = 0
+    with TestClient(app) as client:
+        for email in ("admin@example.com", "student@example.com"):
+            client.post("/api/v1/auth/signup", json={"email": email, "password": PASSWORD})
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE users SET is_admin = 1 WHERE email = 'admin@example.com'")
+
+        for claims in (True, False):
+            settings.AUTH_CLAIMS_IN_TOKEN = claims
+            for email, expected in (("admin@example.com", 200), ("student@example.com", 403)):
+                token = client.post(
+                    "/api/v1/auth/login", json={"email": email, "password": PASSWORD}
+                ).json()["accessToken"]
+                csv = f"email,password\nnew-{claims}-{expected}@example.com,{PASSWORD}\n"
+                response = client.post(
+                    "/api/v1/users/bulk",
+                    files={"file": ("accounts.csv", csv, "text/csv")},
+                    headers={"Authorization": f"Bearer {token}"},
+                )
+                ok = response.status_code == expected and (expected != 200 or response.json()["created"] == 1)
+                failures += not ok
+                print(f"{'ok' if ok else 'FAIL':4}  claims={claims!s:5} {email:20} bulk    -> {response.status_code}")
+                response = client.get("/api/v1/metrics/", headers={"Authorization": f"Bearer {token}"})
+                ok = response.status_code == expected
+                failures += not ok
+                print(f"{'ok' if ok else 'FAIL':4}  claims={claims!s:5} {email:20} metrics -> {response.status_code}")
+    return failures
+
+
+def main():
+    with temporary_app() as tmp:
+        failures = run(os.path.join(tmp, APP_DB))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Check that a slow chat request does not stall the other requests served by
+the same event loop.
+
+Runs the app in-process against a temporary SQLite database with the SQLite
+invalidation bus. Write locks are held on both the application database and
+the invalidation file, so GET /chat/status (which resets the daily credit,
+commits, and broadcasts the principal invalidation) waits --hold seconds for
+its commit and the broadcast waits twice that. Meanwhile GET / is requested
+over and over; the longest gap between them must stay far below the hold, and the chat
+response must not wait for the broadcast. A handler that did blocking I/O
+on the event loop would stall those requests for the whole hold.
+
+    python -m app.scripts.check_async_concurrency --hold 1.0
+"""
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import time
+
+from app.scripts.fixtures import APP_DB, temporary_app
+
+
+async def run(hold: float, db_path: str, bus_path: str) -> int:
+    import httpx
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    chat_times = []
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+            response = await client.post(
+                "/api/v1/auth/signup", json={"email": "chat@example.com", "password": "Secret123!"}
+            )
+            headers = {"Authorization": f"Bearer {response.json()['accessToken']}"}
+
+            db_lock, bus_lock = (sqlite3.connect(path, isolation_level=None) for path in (db_path, bus_path))
+            for conn in (db_lock, bus_lock):
+                conn.execute("BEGIN IMMEDIATE")
+            released = asyncio.Event()
+            loop = asyncio.get_running_loop()
+            loop.call_later(hold, db_lock.rollback)
+            loop.call_later(2 * hold, lambda: (bus_lock.rollback(), released.set()))
+
+            start = time.perf_counter()
+            chat = asyncio.create_task(client.get("/api/v1/chat/status", headers=headers))
+            chat.add_done_callback(lambda _: chat_times.append((time.perf_counter() - start) * 1000))
+            # Gaps between consecutive probes: a blocked loop sends none at all
+            gaps = []
+            last = time.perf_counter()
+            while not (chat.done() and released.is_set()):
+                await client.get("/")
+                now = time.perf_counter()
+                gaps.append((now - last) * 1000)
+                last = now
+                await asyncio.sleep(0.01)
+            status = (await chat).status_code
+            db_lock.close()
+            bus_lock.close()
+        # Let the sender thread finish its broadcast before the bus stops
+        await asyncio.sleep(0.1)
+
+    worst = max(gaps) if gaps else 0.0
+    chat_ms = chat_times[0]
+    print(f"chat/status: {status} in {chat_ms:.0f} ms (database locked {hold * 1000:.0f} ms, "
+          f"invalidation bus {2 * hold * 1000:.0f} ms)")
+    print(f"GET / during it: {len(gaps)} requests, longest gap between them {worst:.1f} ms")
+    failures = 0
+    if status != 200 or chat_ms < hold * 900:
+        print("FAIL  the chat request was not held up by the database lock; nothing was measured")
+        failures += 1
+    if chat_ms > hold * 1500:
+        print("FAIL  the chat response waited for the invalidation broadcast")
+        failures += 1
+    if worst > hold * 250:
+        print("FAIL  concurrent requests stalled while the chat request waited")
+        failures += 1
+    if not failures:
+        print("ok    concurrent requests kept being served")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hold", type=float, default=1.0, help="Seconds the write locks are held")
+    args = parser.parse_args()
+
+    with temporary_app(INVALIDATION_BUS_BACKEND="sqlite", INVALIDATION_BUS_SQLITE_PATH="{tmp}/bus.db") as tmp:
+        failures = asyncio.run(run(args.hold, os.path.join(tmp, APP_DB), os.path.join(tmp, "bus.db")))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Check that importing the application stays fast and side-effect free.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter
+against a database path that does not exist, and fails when:
+
+- the cumulative import time of app.main exceeds the budget,
+- a module that only scripts or the first request need is imported
+  (python-docx, the async database drivers),
+- the import created the database file or the login limiter's file.
+
+    python -m app.scripts.check_import_time --budget-ms 1500
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Loaded lazily: by the import scripts, or when the engines are created
+FORBIDDEN = ["docx", "aiosqlite", "asyncpg", "aiomysql"]
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def measure(database_url: str, limiter_path: str):
+    env = dict(
+        os.environ,
+        DATABASE_URL=database_url,
+        LOGIN_RATE_LIMIT_BACKEND="sqlite",
+        LOGIN_RATE_LIMIT_SQLITE_PATH=limiter_path,
+        PYTHONDONTWRITEBYTECODE="1",
+    )
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr)
+    modules = {}
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, _, name = match.groups()
+            modules[name] = (int(self_us), int(cumulative_us))
+    return modules, proc.stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500, help="Maximum cumulative import time of app.main")
+    parser.add_argument("--runs", type=int, default=3, help="Best of N runs")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest modules")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "import_check.db")
+        limiter_path = os.path.join(tmp, "login_rate_limit.db")
+        runs = [measure(f"sqlite:///{db_path}", limiter_path) for _ in range(args.runs)]
+        if os.path.exists(db_path):
+            failures.append("importing app.main created the database file")
+        if os.path.exists(limiter_path):
+            failures.append("importing app.main created the login limiter file")
+
+    modules, stdout = min(runs, key=lambda run: run[0].get("app.main", (0, 0))[1])
+    total_ms = modules["app.main"][1] / 1000
+    print(f"app.main: {total_ms:.0f} ms cumulative (budget {args.budget_ms:.0f} ms)")
+    for name, (self_us, _) in sorted(modules.items(), key=lambda item: -item[1][0])[:args.top]:
+        print(f"  {self_us / 1000:7.1f} ms  {name}")
+
+    if total_ms > args.budget_ms:
+        failures.append(f"import took {total_ms:.0f} ms, over the {args.budget_ms:.0f} ms budget")
+    for name in FORBIDDEN:
+        if name in modules:
+            failures.append(f"{name} is imported at startup")
+    if stdout.strip():
+        failures.append(f"import printed output: {stdout.strip()[:200]}")
+
+    for failure in failures:
+        print(f"FAIL  {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
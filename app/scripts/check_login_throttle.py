@@ -0,0 +1,80 @@
+"""
+Check that a burst of concurrent wrong-password logins cannot get past the
+per-account limit.
+
+Runs the app in-process against a temporary SQLite database, signs up one
+account and fires --burst wrong-password logins for it at once. At most
+LOGIN_MAX_FAILED_PER_ACCOUNT of them may reach bcrypt (counted by the
+password hashing pool) and get a 401; the rest must get 429. A limiter that
+checked the window and recorded the failure only after the verify would let
+the whole burst through.
+
+    python -m app.scripts.check_login_throttle --backend sqlite --burst 20
+"""
+import argparse
+import asyncio
+import sys
+from collections import Counter
+
+from app.scripts.fixtures import temporary_app
+
+PASSWORD = "Secret123!"
+
+
+async def run(burst: int) -> int:
+    import httpx
+
+    from app.core.auth import password_hash_pool
+    from app.core.rate_limit import login_rate_limiter
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://check") as client:
+            await client.post("/api/v1/auth/signup", json={"email": "burst@example.com", "password": PASSWORD})
+            before = password_hash_pool.stats()["completed"]
+            responses = await asyncio.gather(*(
+                client.post("/api/v1/auth/login", json={"email": "burst@example.com", "password": f"Wrong-{i:04d}"})
+                for i in range(burst)
+            ))
+            verifies = password_hash_pool.stats()["completed"] - before
+            after = await client.post("/api/v1/auth/login", json={"email": "burst@example.com", "password": PASSWORD})
+
+    limit = login_rate_limiter.max_per_account
+    statuses = Counter(response.status_code for response in responses)
+    print(f"{login_rate_limiter.stats()['backend']}: {burst} concurrent wrong passwords, limit {limit}")
+    print(f"  bcrypt verifies: {verifies}, responses: {dict(sorted(statuses.items()))}")
+    failures = 0
+    if verifies > limit or statuses[401] > limit:
+        print("FAIL  more guesses reached bcrypt than the per-account limit allows")
+        failures += 1
+    if statuses[429] != burst - statuses[401]:
+        print("FAIL  attempts past the limit were not rejected with 429")
+        failures += 1
+    if after.status_code != 429:
+        print(f"FAIL  the right password inside the locked window got {after.status_code}, not 429")
+        failures += 1
+    if not failures:
+        print("ok    the burst was held to the limit")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", choices=("memory", "sqlite"), default="sqlite")
+    parser.add_argument("--burst", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10, help="bcrypt cost; slow enough for the burst to overlap")
+    args = parser.parse_args()
+
+    with temporary_app(
+        LOGIN_RATE_LIMIT_BACKEND=args.backend,
+        LOGIN_RATE_LIMIT_SQLITE_PATH="{tmp}/limiter.db",
+        BCRYPT_ROUNDS=str(args.rounds),
+    ):
+        failures = asyncio.run(run(args.burst))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
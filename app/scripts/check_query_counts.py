@@ -0,0 +1,85 @@
+"""
+Check that the list endpoints run a fixed number of SQL statements, however
+many rows they return.
+
+Runs the app in-process against a temporary SQLite database filled by the
+docx import, gives one user a dozen finished DASS attempts and a draft, and
+counts the statements each request runs with count_queries(). A request
+fails if it runs more than its budget or repeats a statement (the shape of
+an N+1 loop), and the history check also fails if a 50-item page costs
+more than a 1-item page.
+
+    python -m app.scripts.check_query_counts
+"""
+import sys
+
+from app.scripts.fixtures import import_questions, temporary_app
+
+ATTEMPTS = 12
+
+# (name, path, max statements); the principal is cached after the first request
+CHECKS = [
+    ("tests: catalog cold", "/api/v1/tests/?type=DASS", 3),
+    ("tests: catalog warm", "/api/v1/tests/?type=DASS", 0),
+    ("history: 1 item", "/api/v1/tests/history?type=DASS&limit=1", 1),
+    ("history: 50 items", "/api/v1/tests/history?type=DASS&limit=50", 1),
+    ("drafts: resume", "/api/v1/tests/drafts/RADS", 2),
+]
+
+
+def run() -> int:
+    from fastapi.testclient import TestClient
+
+    from app.core import database
+    from app.core.query_metrics import count_queries
+    from app.main import app
+    from app.models.models import Group, Test
+    from app.services.catalog_service import test_catalog
+
+    failures = 0
+    counts = {}
+    with TestClient(app) as client:
+        with database.SessionLocal() as db:
+            import_questions(db)
+            picks = {}
+            for test_type in ("DASS", "RADS"):
+                tests = db.query(Test).join(Group).filter(Group.name == test_type).order_by(Test.id).all()
+                picks[test_type] = [
+                    {"testId": str(test.id), "optionId": str(min(option.id for option in test.options))}
+                    for test in tests
+                ]
+        token = client.post(
+            "/api/v1/auth/signup", json={"email": "queries@example.com", "password": "Secret123!"}
+        ).json()["accessToken"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for _ in range(ATTEMPTS):
+            client.post("/api/v1/tests/", json=picks["DASS"], headers=headers)
+        client.patch("/api/v1/tests/drafts/RADS", json=picks["RADS"][:10], headers=headers)
+        test_catalog.invalidate()
+
+        for name, path, budget in CHECKS:
+            with count_queries() as log:
+                status = client.get(path, headers=headers).status_code
+            counts[name] = log.count
+            repeated = log.repeated()
+            ok = status == 200 and log.count <= budget and not repeated
+            failures += not ok
+            print(f"{'ok' if ok else 'FAIL':4}  {name:22} {status}  {log.count} statements (budget {budget})")
+            for statement, times in repeated.items():
+                print(f"      repeated {times}x: {' '.join(statement.split())}")
+
+    if counts["history: 50 items"] > counts["history: 1 item"]:
+        print("FAIL  a longer history page runs more statements")
+        failures += 1
+    return failures
+
+
+def main():
+    with temporary_app():
+        failures = run()
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
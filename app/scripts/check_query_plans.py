@@ -0,0 +1,208 @@
+"""
+Seed a throwaway SQLite database with a realistic volume of data and check
+that the hot service queries use an index. Exits non-zero when any query
+falls back to a full table scan or a temporary sort, so CI catches a dropped
+or mis-ordered index.
+
+The schema is built from the Alembic migrations (pass --from-models to use
+Base.metadata instead).
+
+    python -m app.scripts.check_query_plans
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import create_engine, insert, text
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import Base
+from app.models.models import (
+    Group,
+    Option,
+    Post,
+    RevokedToken,
+    SituationalAnswer,
+    SituationalQuestion,
+    SituationalUserAnswer,
+    SituationGroup,
+    Test,
+    TestAnswer,
+    TestAttempt,
+    TestDraft,
+    TestResult,
+    User,
+)
+
+USERS = 2000
+TESTS_PER_GROUP = 60
+OPTIONS_PER_TEST = 4
+QUESTIONS_PER_LEVEL = 25
+LEVELS = 4
+ANSWERS_PER_QUESTION = 4
+USER_ANSWERS = 50000
+POSTS = 5000
+ATTEMPTS = 20000
+
+# SQLite reports these for plans that read every row or sort in a temp b-tree
+BAD_PLAN = re.compile(r"^SCAN (?!.*USING (COVERING )?INDEX)|USE TEMP B-TREE")
+
+
+def seed(db: Session) -> None:
+    rnd = random.Random(0)
+    now = datetime.utcnow()
+    db.execute(insert(User), [
+        {"id": i, "email": f"user{i}@example.com", "username": f"user{i}", "password": "x"}
+        for i in range(1, USERS + 1)
+    ])
+    db.execute(insert(Group), [{"id": i, "name": name} for i, name in enumerate(["DASS", "RADS", "MDQ"], 1)])
+    db.execute(insert(Test), [
+        {"id": (g - 1) * TESTS_PER_GROUP + t, "content": f"test {t}", "group_id": g}
+        for g in range(1, 4) for t in range(1, TESTS_PER_GROUP + 1)
+    ])
+    db.execute(insert(Option), [
+        {"test_id": t, "content": f"option {o}", "level": o}
+        for t in range(1, 3 * TESTS_PER_GROUP + 1) for o in range(1, OPTIONS_PER_TEST + 1)
+    ])
+    db.execute(insert(TestAnswer), [
+        {"test_id": rnd.randint(1, 3 * TESTS_PER_GROUP), "option_id": rnd.randint(1, 3 * TESTS_PER_GROUP * OPTIONS_PER_TEST)}
+        for _ in range(USER_ANSWERS // 5)
+    ])
+    db.execute(insert(TestAttempt), [
+        {"id": i, "user_id": rnd.randint(1, USERS), "test_type": rnd.choice(["DASS", "RADS", "MDQ"]),
+         "started_at": now - timedelta(minutes=i), "finished_at": now - timedelta(minutes=i)}
+        for i in range(1, ATTEMPTS + 1)
+    ])
+    db.execute(insert(TestResult), [
+        {"user_id": 1, "attempt_id": i, "test_type": "DASS", "scores": "{}", "bands": "{}",
+         "answered": 21, "complete": True, "created_at": now}
+        for i in range(1, ATTEMPTS + 1)
+    ])
+    db.execute(insert(TestDraft), [
+        {"user_id": u, "test_type": "RADS", "attempt_id": u, "levels": bytes(30), "updated_at": now}
+        for u in range(1, USERS + 1)
+    ])
+    db.execute(insert(SituationGroup), [{"id": i, "name": f"group {i}"} for i in range(1, 5)])
+    questions = [
+        {"content": f"question {g}-{lvl}-{q}", "situation_group_id": g, "level": lvl}
+        for g in range(1, 5) for lvl in range(1, LEVELS + 1) for q in range(QUESTIONS_PER_LEVEL)
+    ]
+    db.execute(insert(SituationalQuestion), questions)
+    db.execute(insert(SituationalAnswer), [
+        {"question_id": q, "content": f"answer {a}", "is_correct": a == 0}
+        for q in range(1, len(questions) + 1) for a in range(ANSWERS_PER_QUESTION)
+    ])
+    db.execute(insert(SituationalUserAnswer), [
+        {
+            "user_id": rnd.randint(1, USERS),
+            "question_id": (q := rnd.randint(1, len(questions))),
+            "answer_id": (q - 1) * ANSWERS_PER_QUESTION + 1,
+        }
+        for _ in range(USER_ANSWERS)
+    ])
+    db.execute(insert(Post), [
+        {"title": f"post {i}", "content": "...", "author_id": rnd.randint(1, USERS),
+         "created_at": now - timedelta(minutes=rnd.randint(0, 500000))}
+        for i in range(POSTS)
+    ])
+    db.execute(insert(RevokedToken), [
+        {"jti": f"{i:032x}", "user_id": rnd.randint(1, USERS), "expires_at": now + timedelta(minutes=i)}
+        for i in range(5000)
+    ])
+    db.commit()
+    db.execute(text("ANALYZE"))
+
+
+def service_queries(db: Session):
+    """The statements the request handlers issue, keyed by where they come from."""
+    return {
+        "tests: group by name": db.query(Group).filter(Group.name == "DASS"),
+        "tests: tests of a group": db.query(Test).filter(Test.group_id == 1),
+        "tests: options of a test": db.query(Option).filter(Option.test_id == 7),
+        "tests: history page": (
+            db.query(TestAttempt, TestResult)
+            .join(TestResult, TestResult.attempt_id == TestAttempt.id)
+            .filter(TestAttempt.user_id == 17, TestAttempt.test_type == "DASS", TestAttempt.finished_at.isnot(None))
+            .filter(TestAttempt.finished_at < datetime.utcnow())
+            .order_by(TestAttempt.finished_at.desc(), TestAttempt.id.desc())
+            .limit(11)
+        ),
+        "tests: draft of a user": db.query(TestDraft).filter(TestDraft.user_id == 17, TestDraft.test_type == "RADS"),
+        "situational: questions by group and level": db.query(SituationalQuestion).filter(
+            SituationalQuestion.situation_group_id == 2, SituationalQuestion.level == 3
+        ),
+        "situational: questions of a group": db.query(SituationalQuestion).filter(
+            SituationalQuestion.situation_group_id == 2
+        ),
+        "situational: answers of a question": db.query(SituationalAnswer).filter(
+            SituationalAnswer.question_id == 42
+        ),
+        "situational: answers of a user": db.query(SituationalUserAnswer).filter(
+            SituationalUserAnswer.user_id == 17
+        ),
+        "posts: newest page": db.query(Post).order_by(Post.created_at.desc()).offset(20).limit(10),
+        "auth: user by email": db.query(User).filter(User.email == "user17@example.com"),
+        "revocation: expired tokens": db.query(RevokedToken).filter(RevokedToken.expires_at < datetime.utcnow()),
+    }
+
+
+def explain(db: Session, query) -> list:
+    sql = str(query.statement.compile(db.get_bind(), compile_kwargs={"literal_binds": True}))
+    return [row[-1] for row in db.execute(text("EXPLAIN QUERY PLAN " + sql))]
+
+
+def build_schema(url: str, from_models: bool, revision: str = "head") -> None:
+    if from_models:
+        Base.metadata.create_all(create_engine(url))
+        return
+    from alembic import command
+    from alembic.config import Config
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    config = Config(os.path.join(root, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(root, "migrations"))
+    # migrations/env.py takes the URL from Settings
+    previous = settings.DATABASE_URL
+    settings.DATABASE_URL = url
+    try:
+        command.upgrade(config, revision)
+    finally:
+        settings.DATABASE_URL = previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--from-models", action="store_true", help="Build the schema from the models")
+    parser.add_argument("--revision", default="head", help="Migrate to this revision instead of head")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan")
+    args = parser.parse_args()
+
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{os.path.join(tmp, 'plans.db')}"
+        build_schema(url, args.from_models, args.revision)
+        engine = create_engine(url)
+        with Session(engine) as db:
+            seed(db)
+            for name, query in service_queries(db).items():
+                plan = explain(db, query)
+                bad = [step for step in plan if BAD_PLAN.search(step)]
+                failures += bool(bad)
+                print(f"{'FAIL' if bad else 'ok':4}  {name}")
+                if bad or args.verbose:
+                    for step in plan:
+                        print(f"        {step}")
+        engine.dispose()
+
+    if failures:
+        print(f"{failures} queries without a usable index")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Check read-replica routing and read-your-writes stickiness across workers.
+
+Two temporary SQLite files stand in for the primary and the replica, and the
+SQLite invalidation bus connects two app workers (this process and a spawned
+one). GET /tests/history, a get_read_db endpoint, must:
+
+- read from the replica while the user has not written;
+- read from the primary right after the user writes through this worker;
+- read from the primary after the user writes through the *other* worker;
+- go back to the replica once READ_YOUR_WRITES_SECONDS have passed.
+
+    python -m app.scripts.check_read_replica
+"""
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+from app.scripts.fixtures import app_env
+
+WINDOW_SECONDS = 2
+
+
+def _configure(tmp: str) -> None:
+    # Settings are read on import, so configure before importing the app
+    os.environ.update(app_env(
+        tmp,
+        DATABASE_REPLICA_URL="sqlite:///{tmp}/replica.db",
+        READ_YOUR_WRITES_SECONDS=str(WINDOW_SECONDS),
+        INVALIDATION_BUS_BACKEND="sqlite",
+        INVALIDATION_BUS_SQLITE_PATH="{tmp}/bus.db",
+    ))
+
+
+def other_worker(tmp: str, token: str, done) -> None:
+    """A second app worker: the user's write lands here."""
+    _configure(tmp)
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as client:
+        status = client.put(
+            "/api/v1/users/", json={"displayName": "Elsewhere"}, headers={"Authorization": f"Bearer {token}"}
+        ).status_code
+        # Let the sender thread broadcast before the bus stops
+        time.sleep(0.5)
+    done.put(status)
+
+
+def run(tmp: str) -> int:
+    from fastapi.testclient import TestClient
+    from sqlalchemy import event
+
+    from app.core import database
+    from app.core.config import settings
+    from app.main import app
+
+    served = []
+    failures = 0
+    with TestClient(app) as client:
+        database.Base.metadata.create_all(database.replica_engine)
+        for name, sync_engine in (("primary", database.engine), ("replica", database.replica_engine)):
+            event.listen(
+                sync_engine, "before_cursor_execute", lambda *args, name=name: served.append(name)
+            )
+        token = client.post(
+            "/api/v1/auth/signup", json={"email": "reader@example.com", "password": "Secret123!"}
+        ).json()["accessToken"]
+        headers = {"Authorization": f"Bearer {token}"}
+
+        def history_on(expected: str, label: str) -> None:
+            nonlocal failures
+            served.clear()
+            status = client.get("/api/v1/tests/history?type=DASS", headers=headers).status_code
+            engines = sorted(set(served))
+            ok = status == 200 and engines == [expected]
+            failures += not ok
+            print(f"{'ok' if ok else 'FAIL':4}  {label:38} read from {', '.join(engines) or 'nothing'}")
+
+        # Signing up wrote through this worker; wait that window out first
+        time.sleep(WINDOW_SECONDS + 0.2)
+        history_on("replica", "no recent write")
+
+        client.put("/api/v1/users/", json={"displayName": "Here"}, headers=headers)
+        history_on("primary", "after a write on this worker")
+        time.sleep(WINDOW_SECONDS + 0.2)
+        history_on("replica", "after the window")
+
+        ctx = multiprocessing.get_context("spawn")
+        done = ctx.Queue()
+        worker = ctx.Process(target=other_worker, args=(tmp, token, done))
+        worker.start()
+        status = done.get(timeout=60)
+        worker.join()
+        if status != 200:
+            print(f"FAIL  the write on the other worker got {status}")
+            failures += 1
+        # The bus delivers within a poll interval
+        time.sleep(settings.INVALIDATION_BUS_POLL_INTERVAL_MS / 1000 * 2)
+        history_on("primary", "after a write on another worker")
+        time.sleep(WINDOW_SECONDS + 0.2)
+        history_on("replica", "after that window")
+    return failures
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        _configure(tmp)
+        failures = run(tmp)
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
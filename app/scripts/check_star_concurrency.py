@@ -0,0 +1,87 @@
+"""
+Award stars to one account from many threads at once and check that no
+increment is lost: the final balance must equal the number of awards and
+the star_ledger sum. The old read-modify-write update is run first for
+comparison.
+
+    python -m app.scripts.check_star_concurrency --threads 16 --awards 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, install_sqlite_pragmas
+from app.models.models import User
+from app.services.star_service import StarService, SITUATIONAL
+
+
+def read_modify_write(db, user_id: int) -> None:
+    user = db.query(User).filter(User.id == user_id).first()
+    user.stars = (user.stars or 0) + 1
+    db.commit()
+
+
+def atomic(db, user_id: int) -> None:
+    StarService.award(db, user_id, 1, SITUATIONAL)
+    db.commit()
+
+
+def run(award, threads: int, awards: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, 'stars.db')}", pool_size=threads)
+        install_sqlite_pragmas(engine)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        with Session() as db:
+            user = User(email="stars@example.com", password="x", stars=0)
+            db.add(user)
+            db.commit()
+            user_id = user.id
+
+        errors = []
+        start = threading.Barrier(threads)
+
+        def worker():
+            start.wait()
+            for _ in range(awards):
+                with Session() as db:
+                    try:
+                        award(db, user_id)
+                    except Exception as e:
+                        errors.append(e)
+
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        for t in pool:
+            t.start()
+        for t in pool:
+            t.join()
+
+        with Session() as db:
+            balance = db.query(User.stars).filter(User.id == user_id).scalar()
+            ledger = StarService.ledger_balance(db, user_id)
+        engine.dispose()
+    return balance, ledger, len(errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--awards", type=int, default=50, help="Awards per thread")
+    args = parser.parse_args()
+    expected = args.threads * args.awards
+
+    balance, _, errors = run(read_modify_write, args.threads, args.awards)
+    print(f"read-modify-write: {balance}/{expected} stars, {errors} errors")
+    balance, ledger, errors = run(atomic, args.threads, args.awards)
+    print(f"atomic + ledger:   {balance}/{expected} stars, ledger sum {ledger}, {errors} errors")
+    if balance != expected or ledger != expected or errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
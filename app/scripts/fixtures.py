@@ -0,0 +1,83 @@
+"""
+Scaffolding shared by the check and benchmark scripts.
+
+temporary_app() points the app's settings at a throwaway SQLite database for
+scripts that run the whole app in-process; seeded_catalog() gives the
+benchmarks a bare engine on a throwaway database filled by the docx import.
+
+App modules are imported inside the functions: settings are read when the
+app is first imported, so scripts must be able to import this module before
+they configure the environment.
+"""
+import contextlib
+import io
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+APP_DB = "app.db"
+
+
+def app_env(tmp: str, **overrides: str) -> Dict[str, str]:
+    """
+    Settings for running the app on a SQLite database in tmp, with nothing
+    shared outside the process. "{tmp}" in an override value is replaced by
+    the directory.
+    """
+    env = {
+        "DATABASE_URL": f"sqlite:///{os.path.join(tmp, APP_DB)}",
+        "DATABASE_REPLICA_URL": "",
+        "INVALIDATION_BUS_BACKEND": "local",
+        "LOGIN_RATE_LIMIT_BACKEND": "memory",
+        "WARMUP_ENABLED": "false",
+        "BCRYPT_ROUNDS": "4",
+    }
+    env.update({key: value.format(tmp=tmp) for key, value in overrides.items()})
+    return env
+
+
+@contextmanager
+def temporary_app(**overrides: str) -> Iterator[str]:
+    """
+    Configure the app for a temporary directory (see app_env) and yield the
+    directory. Enter this before importing app.main.
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ.update(app_env(tmp, **overrides))
+        yield tmp
+
+
+def import_questions(db) -> None:
+    """The docx import, without its per-question output."""
+    from app.services.question_service import QuestionService
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        QuestionService.import_all_questions(db)
+
+
+@contextmanager
+def seeded_catalog(name: str = "catalog.db", **engine_options):
+    """
+    Yield a session factory bound to a fresh SQLite file holding the schema
+    and the imported questions. engine_options go to create_engine.
+    """
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from app.core.database import Base, install_sqlite_pragmas
+    from app.core.invalidation import LocalInvalidationBackend, invalidation_bus
+
+    # Nothing to broadcast to; keep the import from reaching for a real bus
+    invalidation_bus.backend = LocalInvalidationBackend()
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_engine(f"sqlite:///{os.path.join(tmp, name)}", **engine_options)
+        install_sqlite_pragmas(engine)
+        Base.metadata.create_all(engine)
+        Session = sessionmaker(bind=engine, autoflush=False)
+        try:
+            with Session() as db:
+                import_questions(db)
+            yield Session
+        finally:
+            engine.dispose()
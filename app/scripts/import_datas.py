@@ -1,8 +1,9 @@
-from app.core.database import SessionLocal
+from app.core.database import SessionLocal, init_engines
 from app.services.question_service import QuestionService
 from app.services.situational_service import SituationalService
 
 def main():
+    init_engines()
     db = SessionLocal()
     try:
         QuestionService.import_all_questions(db)
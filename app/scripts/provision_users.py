@@ -0,0 +1,57 @@
+"""
+Create user accounts in bulk from a CSV or NDJSON file.
+
+CSV files need a header with at least ``email`` and ``password``. The
+optional ``username``, ``displayName`` and ``dob`` columns are accepted.
+A per-row status file is written next to the input unless --output is given.
+
+    python -m app.scripts.provision_users students.csv --workers 8
+"""
+import argparse
+import csv
+import functools
+import os
+
+from app.core.database import SessionLocal, init_engines
+from app.services.provisioning_service import ProvisioningService, hash_in_processes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("input", help="CSV or NDJSON file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="Defaults to the file extension")
+    parser.add_argument("--output", help="Status file (CSV)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Hashing processes")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per INSERT")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.input.lower().endswith(".csv") else "ndjson")
+    output = args.output or os.path.splitext(args.input)[0] + ".status.csv"
+
+    with open(args.input, encoding="utf-8-sig") as f:
+        rows = ProvisioningService.parse_rows(f.read(), fmt)
+
+    init_engines()
+    db = SessionLocal()
+    try:
+        summary = ProvisioningService.provision(
+            rows,
+            db,
+            hash_passwords=functools.partial(hash_in_processes, workers=args.workers),
+            batch_size=args.batch_size,
+        )
+    finally:
+        db.close()
+
+    with open(output, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=["row", "email", "status", "detail"])
+        writer.writeheader()
+        writer.writerows(summary["results"])
+
+    print(f"Created {summary['created']}/{summary['total']} users in {summary['elapsed_seconds']}s "
+          f"({summary['users_per_second']} users/sec)")
+    print(f"Status written to {output}")
+
+
+if __name__ == "__main__":
+    main()
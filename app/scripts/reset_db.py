@@ -1,8 +1,9 @@
-from app.core.database import Base, engine
+from app.core.database import Base, init_engines
 from app.models.models import User, Group, SubGroup, Test, TestAnswer, Post, Entity, SituationalQuestion, SituationalAnswer
 from sqlalchemy import inspect
 
 def reset_database():
+    engine = init_engines()
     # Get inspector to check existing tables
     inspector = inspect(engine)
     existing_tables = inspector.get_table_names()
@@ -0,0 +1,39 @@
+"""
+Grant or remove admin rights (the users:admin scope) for an account.
+
+The user's issued tokens are revoked so the change takes effect on the next
+login or refresh rather than when the old tokens expire.
+
+    python -m app.scripts.set_admin teacher@example.com
+    python -m app.scripts.set_admin teacher@example.com --remove
+"""
+import argparse
+import sys
+
+from app.core.auth import revoke_user_tokens
+from app.core.database import SessionLocal, init_engines
+from app.models.models import User
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("email")
+    parser.add_argument("--remove", action="store_true", help="Remove admin rights instead")
+    args = parser.parse_args()
+
+    init_engines()
+    db = SessionLocal()
+    try:
+        user = db.query(User).filter(User.email == args.email).first()
+        if user is None:
+            print(f"No user with email {args.email}")
+            sys.exit(1)
+        user.is_admin = not args.remove
+        revoke_user_tokens(user, db)
+        print(f"{args.email}: admin {'removed' if args.remove else 'granted'}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
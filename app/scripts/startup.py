@@ -0,0 +1,35 @@
+"""
+Container entry point: run the startup checks and serve the app from the
+same interpreter.
+
+Waits for the database, migrates it to head and seeds the question content
+when the .docx files changed (app.core.bootstrap), then starts uvicorn.
+Replacing the alembic/import subprocesses in startup.sh saves several cold
+interpreter starts per boot.
+
+    python -m app.scripts.startup --host 0.0.0.0 --port 8000
+"""
+import argparse
+import logging
+
+import uvicorn
+
+from app.core.bootstrap import bootstrap
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--check-only", action="store_true", help="Run the startup checks and exit")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    bootstrap()
+    if not args.check_only:
+        uvicorn.run("app.main:app", host=args.host, port=args.port, workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
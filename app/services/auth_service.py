@@ -1,12 +1,19 @@
 from fastapi import HTTPException, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from app.models.models import User
 from app.schemas.user import UserLogin, UserCreate
-from app.core.auth import verify_password, get_password_hash, create_user_token, create_access_token, SECRET_KEY, ALGORITHM
-from typing import Any, Dict
-from jose import jwt
+from app.core.auth import verify_password, get_password_hash, password_needs_rehash, create_user_token, create_access_token, invalidate_principal, revoke_user_tokens, revoke_user_tokens_async, SECRET_KEY, ALGORITHM
+from app.core.config import settings
+from app.core.rate_limit import login_rate_limiter
+from app.core.revocation import refresh_token_revocations
+from typing import Any, Dict, Optional
+from jose import JWTError, jwt
 from datetime import datetime, timedelta
+import hashlib
 import json
+import uuid
 
 class AuthService:
     @staticmethod
@@ -25,23 +32,43 @@ class AuthService:
 
     @staticmethod
     def create_refresh_token(user: User) -> str:
-        expire = datetime.utcnow() + timedelta(days=7)  # Refresh token sống 7 ngày
+        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
         to_encode = {
             "sub": user.email,
             "type": "refresh",
+            "jti": uuid.uuid4().hex,
+            "ver": user.token_version or 0,
             "exp": expire
         }
         return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
     @staticmethod
-    def login(user_login: UserLogin, db: Session) -> Dict[str, Any]:
-        user = db.query(User).filter(User.email == user_login.email).first()
+    async def login(user_login: UserLogin, db: AsyncSession, client_ip: Optional[str] = None) -> Dict[str, Any]:
+        # Reject throttled callers before any query or bcrypt work; the
+        # attempt counts as failed until the password checks out
+        reserved_at = await login_rate_limiter.run(login_rate_limiter.reserve, user_login.email, client_ip)
 
-        if not user or not verify_password(user_login.password, user.password):
+        result = await db.execute(select(User).where(User.email == user_login.email))
+        user = result.scalars().first()
+
+        try:
+            verified = user is not None and await verify_password(user_login.password, user.password)
+        except HTTPException:
+            # Shed by the hashing pool: the password was never checked
+            await login_rate_limiter.run(login_rate_limiter.release, user_login.email, client_ip, reserved_at)
+            raise
+        if not verified:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
             )
+        await login_rate_limiter.run(login_rate_limiter.record_success, user_login.email, client_ip, reserved_at)
+
+        if password_needs_rehash(user.password):
+            # Bring the stored hash to the configured BCRYPT_ROUNDS
+            user.password = await get_password_hash(user_login.password)
+            await db.commit()
+            invalidate_principal(user.email)
 
         token = create_user_token(user)
         refresh_token = AuthService.create_refresh_token(user)
@@ -52,26 +79,28 @@ class AuthService:
         }
 
     @staticmethod
-    def signup(user_create: UserCreate, db: Session) -> Dict[str, Any]:
-        existing_user = db.query(User).filter(User.email == user_create.email).first()
-        if existing_user:
+    async def signup(user_create: UserCreate, db: AsyncSession) -> Dict[str, Any]:
+        result = await db.execute(select(User.id).where(User.email == user_create.email))
+        if result.first() is not None:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
 
-        hashed_password = get_password_hash(user_create.password)
+        hashed_password = await get_password_hash(user_create.password)
         user = User(email=user_create.email, password=hashed_password)
         
         try:
             db.add(user)
-            db.commit()
+            await db.commit()
         except Exception:
-            db.rollback()
+            await db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Email already registered"
             )
+        # Load the server-side defaults; nothing may lazy-load on an AsyncSession
+        await db.refresh(user)
 
         token = create_user_token(user)
         refresh_token = AuthService.create_refresh_token(user)
@@ -82,32 +111,68 @@ class AuthService:
         }
 
     @staticmethod
-    def change_password(email: str, old_password: str, new_password: str, db: Session) -> Dict[str, str]:
-        user = db.query(User).filter(User.email == email).first()
-        if not user or not verify_password(old_password, user.password):
+    async def change_password(email: str, old_password: str, new_password: str, db: AsyncSession) -> Dict[str, str]:
+        result = await db.execute(select(User).where(User.email == email))
+        user = result.scalars().first()
+        if not user or not await verify_password(old_password, user.password):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Incorrect email or password"
             )
 
-        user.password = get_password_hash(new_password)
-        db.commit()
-        return {"msg": "Password updated successfully"} 
+        user.password = await get_password_hash(new_password)
+        # Signs out every other session: all issued tokens carry the old version
+        await revoke_user_tokens_async(user, db)
+        return {
+            "msg": "Password updated successfully",
+            "accessToken": create_user_token(user)["access_token"],
+            "refreshToken": AuthService.create_refresh_token(user)
+        }
+
+    @staticmethod
+    def logout_all(user: User, db: Session) -> Dict[str, str]:
+        db_user = db.query(User).filter(User.id == user.id).first()
+        if db_user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        revoke_user_tokens(db_user, db)
+        return {"msg": "Logged out from all devices"}
     
     @staticmethod
     def refresh_access_token(refresh_token: str, db: Session) -> dict:
+        """
+        Exchange a refresh token for a new access/refresh pair.
+
+        Each refresh token is single use. Its jti is recorded on rotation, and
+        presenting it again revokes every token of the user.
+        """
+        invalid = HTTPException(status_code=401, detail="Invalid refresh token")
         try:
             payload = jwt.decode(refresh_token, SECRET_KEY, algorithms=[ALGORITHM])
-            email = payload.get("sub")
-            if not email:
-                raise HTTPException(status_code=401, detail="Invalid refresh token")
-            user = db.query(User).filter(User.email == email).first()
-            if not user:
-                raise HTTPException(status_code=401, detail="User not found")
-            access_token = create_user_token(user)["access_token"]
-            return {
-                "accessToken": access_token,
-                "refreshToken": refresh_token
-            }
-        except Exception:
-            raise HTTPException(status_code=401, detail="Invalid refresh token")
\ No newline at end of file
+        except JWTError:
+            raise invalid
+        email = payload.get("sub")
+        if not email or payload.get("type") != "refresh":
+            raise invalid
+        # Tokens issued before rotation existed have no jti; key them by digest
+        jti = payload.get("jti") or hashlib.sha256(refresh_token.encode()).hexdigest()
+
+        user = db.query(User).filter(User.email == email).first()
+        if not user:
+            raise HTTPException(status_code=401, detail="User not found")
+        if payload.get("ver", 0) != (user.token_version or 0):
+            raise invalid
+
+        expires_at = datetime.utcfromtimestamp(payload["exp"])
+        if (
+            refresh_token_revocations.is_revoked(jti, db)
+            or not refresh_token_revocations.revoke(jti, user.id, expires_at, db)
+        ):
+            # This token was already rotated once: treat it as stolen
+            revoke_user_tokens(user, db)
+            raise invalid
+        db.commit()
+
+        return {
+            "accessToken": create_user_token(user)["access_token"],
+            "refreshToken": AuthService.create_refresh_token(user)
+        }
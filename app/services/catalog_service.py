@@ -0,0 +1,177 @@
+import hashlib
+import json
+import threading
+import time
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.invalidation import invalidation_bus
+from app.models.models import Group, Test
+
+TEST_TYPES = ("RADS", "DASS", "MDQ")
+
+
+class CatalogEntry(NamedTuple):
+    body: bytes
+    etag: str
+
+
+# test id -> {option id: level}, for validating and scoring submissions
+OptionIndex = Dict[int, Dict[int, int]]
+
+
+class TestInfo(NamedTuple):
+    test_type: str
+    code: Optional[str]
+    position: int  # 1-based, in id order within the test type
+
+
+class CatalogIndex(NamedTuple):
+    options: OptionIndex
+    tests: Dict[int, TestInfo]
+    items: Dict[str, List[int]]  # test type -> test ids by position
+    etags: Dict[str, str]  # test type -> ETag of the payload from the same build
+
+
+def _render(content: Any) -> bytes:
+    # Same encoding as fastapi's JSONResponse
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _entry(content: Any) -> CatalogEntry:
+    body = _render(content)
+    return CatalogEntry(body, '"' + hashlib.sha256(body).hexdigest()[:32] + '"')
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 asks for GET)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
+
+
+class TestCatalog:
+    """
+    GET /tests payloads for every test type, serialized once, and the
+    option index answer submissions are checked against.
+
+    The content only changes when the docx import runs, which publishes on
+    the "catalog" invalidation namespace; the next request rebuilds every
+    type in one eager-loaded pass.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, CatalogEntry] = {}
+        self._index: Optional[CatalogIndex] = None
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.hits = 0
+        self.builds = 0
+        self.last_build_ms: Optional[float] = None
+
+    @staticmethod
+    def build_payloads(db: Session) -> Tuple[Dict[str, List[Dict[str, Any]]], CatalogIndex]:
+        groups = {}
+        for group in db.query(Group).filter(Group.name.in_(TEST_TYPES)).order_by(Group.id):
+            groups.setdefault(group.name, group.id)
+        group_types = {group_id: name for name, group_id in groups.items()}
+        tests = (
+            db.query(Test)
+            .filter(Test.group_id.in_(groups.values()))
+            .options(selectinload(Test.options))
+            .order_by(Test.id)
+            .all()
+        ) if groups else []
+        by_group: Dict[int, list] = {}
+        index = CatalogIndex({}, {}, {}, {})
+        for test in tests:
+            test_type = group_types[test.group_id]
+            index.options[test.id] = {option.id: option.level for option in test.options}
+            index.items.setdefault(test_type, []).append(test.id)
+            index.tests[test.id] = TestInfo(test_type, test.code, len(index.items[test_type]))
+            by_group.setdefault(test.group_id, []).append({
+                "id": str(test.id),
+                "content": test.content,
+                "options": [
+                    {"id": str(option.id), "content": option.content, "level": option.level}
+                    for option in sorted(test.options, key=lambda option: option.id)
+                ],
+                "code": test.code,
+            })
+
+        payloads = {}
+        for test_type in TEST_TYPES:
+            items = by_group.get(groups.get(test_type), [])
+            if not items:
+                payloads[test_type] = []
+            elif test_type == "DASS":
+                # Nhóm theo code (A, S, D)
+                code_map: Dict[str, list] = {}
+                for item in items:
+                    code_map.setdefault(item.pop("code") or "Khác", []).append(item)
+                payloads[test_type] = [{"group": code, "test": test_list} for code, test_list in code_map.items()]
+            else:
+                for item in items:
+                    del item["code"]
+                payloads[test_type] = [{"group": test_type, "test": items}]
+        return payloads, index
+
+    def get(self, test_type: str, db: Session) -> CatalogEntry:
+        entry = self._entries.get(test_type)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        with self._lock:
+            entry = self._entries.get(test_type)
+            if entry is None:
+                entry = self.build(db)[0][test_type]
+        return entry
+
+    def index(self, db: Session) -> CatalogIndex:
+        index = self._index
+        if index is not None:
+            return index
+        with self._lock:
+            index = self._index
+            if index is None:
+                index = self.build(db)[1]
+        return index
+
+    def option_index(self, db: Session) -> OptionIndex:
+        return self.index(db).options
+
+    def build(self, db: Session) -> Tuple[Dict[str, CatalogEntry], CatalogIndex]:
+        generation = self._generation
+        start = time.perf_counter()
+        payloads, index = self.build_payloads(db)
+        entries = {test_type: _entry(payload) for test_type, payload in payloads.items()}
+        index.etags.update({test_type: entry.etag for test_type, entry in entries.items()})
+        self.last_build_ms = round((time.perf_counter() - start) * 1000, 1)
+        self.builds += 1
+        # An import that finished while we were reading wins; rebuild next time
+        if generation == self._generation:
+            self._entries = entries
+            self._index = index
+        return entries, index
+
+    def invalidate(self, key: Optional[str] = None) -> None:
+        """Drop every type: they are rebuilt together anyway."""
+        self._generation += 1
+        self._entries = {}
+        self._index = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "types": sorted(self._entries),
+            "hits": self.hits,
+            "builds": self.builds,
+            "last_build_ms": self.last_build_ms,
+            "etags": {test_type: entry.etag for test_type, entry in self._entries.items()},
+        }
+
+
+test_catalog = TestCatalog()
+invalidation_bus.subscribe("catalog", test_catalog.invalidate)
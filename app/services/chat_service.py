@@ -1,18 +1,18 @@
 from datetime import datetime, date
 import httpx
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.models import User
 from typing import Dict, Any, Optional
-from app.core.config import Settings
+from app.core.config import settings
+from app.core.auth import invalidate_principal
 
 
-settings = Settings()
 CHAT_API_URL = settings.CHAT_API_URL
 CHAT_API_KEY = settings.CHAT_API_KEY
 DEFAULT_CHAT_MODEL = settings.DEFAULT_CHAT_MODEL
 
-def can_send_chat(user: User, db: Session) -> bool:
+async def can_send_chat(user: User, db: AsyncSession) -> bool:
     """
     Check if user can send a chat message.
     Resets the chat count if it's a new day.
@@ -22,8 +22,9 @@ def can_send_chat(user: User, db: Session) -> bool:
     # If it's a new day, reset the chat count
     if user.last_chat_date is None or user.last_chat_date.date() < today:
         user.free_chat = 3  # Reset to 3 messages per day
-        user.last_chat_date = datetime.utcnow()
-        db.commit()
+        user.last_chat_date = datetime.datetime.utcnow()
+        await db.commit()
+        invalidate_principal(user.email)
 
     # Check if user has remaining chats
     if user.free_chat <= 0:
@@ -73,31 +74,30 @@ async def send_chat_message(message: str) -> Dict[str, Any]:
 import datetime
 
 
-def use_chat_credit(user: User, db: Session) -> bool:
+async def use_chat_credit(user: User, db: AsyncSession) -> bool:
     """
     Deduct one chat credit from the user.
     Returns True if credit was used, False if no credits left.
     """
-    # Đảm bảo user nằm trong session đúng
-    user = db.merge(user)
-    db.refresh(user)
+    # Đảm bảo dữ liệu user mới nhất
+    await db.refresh(user)
 
     if user.free_chat <= 0:
         return False
 
     user.free_chat -= 1
     user.last_chat_date = datetime.datetime.now(datetime.UTC)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    invalidate_principal(user.email)
     return True
 
 
-def get_remaining_chats(user: User, db: Session) -> dict:
+async def get_remaining_chats(user: User, db: AsyncSession) -> dict:
     """
     Get the remaining number of chats for the user today.
     """
     # This will reset the count if it's a new day
-    can_send = can_send_chat(user, db)
+    can_send = await can_send_chat(user, db)
 
     return {
         "remaining_chats": max(0, user.free_chat),  # Ensure non-negative
@@ -0,0 +1,206 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.models import TestAttempt, TestDraft, User
+from app.services.catalog_service import CatalogIndex, test_catalog
+from app.services.test_service import MAX_ANSWERS_PER_SUBMISSION, TestService
+
+# A draft cell holds option level + 1; 0 means the item is unanswered
+EMPTY = 0
+
+
+class DraftAnswerIn(BaseModel):
+    testId: str
+    optionId: Optional[str] = None  # None clears the answer
+
+
+def _check_current(draft: TestDraft, index: CatalogIndex) -> None:
+    # Cells are positions in the catalog the draft was saved against
+    if draft.catalog_etag != index.etags.get(draft.test_type):
+        raise HTTPException(
+            status_code=409,
+            detail="The test has changed since this draft was saved; discard it or save again to start over",
+        )
+
+
+def _draft_out(draft: TestDraft, total: int) -> Dict[str, Any]:
+    return {
+        "type": draft.test_type,
+        "attemptId": draft.attempt_id,
+        "answered": sum(1 for cell in draft.levels[:total] if cell != EMPTY),
+        "total": total,
+        "updatedAt": draft.updated_at.isoformat(),
+    }
+
+
+class DraftService:
+    """
+    Resumable, partially answered tests: one row per user and test type
+    whose cells are packed into a byte string, one byte per item. Autosaves
+    send only the changed items and rewrite that single row; finalizing
+    turns the cells into the permanent test_answer rows.
+
+    Each draft records the catalog ETag its positions refer to. Once a
+    question import changes the test, the old cells no longer line up:
+    reading or finalizing such a draft is refused with 409, and the next
+    save starts it over against the current catalog.
+    """
+
+    @staticmethod
+    def validate_changes(
+        changes: List[DraftAnswerIn], test_type: str, index: CatalogIndex
+    ) -> Tuple[List[Tuple[int, int]], List[Dict[str, Any]]]:
+        """
+        Check a delta against the catalog. Returns (position, cell) pairs,
+        position being 1-based in catalog order, and the per-item errors.
+        """
+        cells = []
+        errors = []
+        for i, change in enumerate(changes):
+            try:
+                test_id = int(change.testId)
+                option_id = int(change.optionId) if change.optionId is not None else None
+            except ValueError:
+                errors.append({"index": i, "msg": "testId and optionId must be integers"})
+                continue
+            info = index.tests.get(test_id)
+            if info is None or info.test_type != test_type:
+                errors.append({"index": i, "msg": f"Test {test_id} is not part of {test_type}"})
+            elif option_id is None:
+                cells.append((info.position, EMPTY))
+            elif option_id not in index.options[test_id]:
+                errors.append({"index": i, "msg": f"Option {option_id} does not belong to test {test_id}"})
+            else:
+                cells.append((info.position, index.options[test_id][option_id] + 1))
+        return cells, errors
+
+    @staticmethod
+    def answers(draft: TestDraft, index: CatalogIndex) -> List[Tuple[int, int]]:
+        """The draft's answered cells as (test_id, option_id) rows."""
+        rows = []
+        for test_id, cell in zip(index.items.get(draft.test_type, ()), draft.levels):
+            if cell == EMPTY:
+                continue
+            # A level the item no longer offers is skipped
+            option_id = next(
+                (option_id for option_id, level in index.options[test_id].items() if level == cell - 1), None
+            )
+            if option_id is not None:
+                rows.append((test_id, option_id))
+        return rows
+
+    @staticmethod
+    def _locked(db: Session, user_id: int, test_type: str) -> Optional[TestDraft]:
+        return (
+            db.query(TestDraft)
+            .filter(TestDraft.user_id == user_id, TestDraft.test_type == test_type)
+            .with_for_update()
+            .one_or_none()
+        )
+
+    @staticmethod
+    def save(test_type: str, changes: List[DraftAnswerIn], current_user: User, db: Session) -> Dict[str, Any]:
+        """
+        Apply the changed items to the user's draft, creating it (and its
+        unfinished attempt) on the first save, and resetting it when the
+        test changed since the last one. Re-sending a change is harmless,
+        so clients can retry freely.
+        """
+        if not changes:
+            raise HTTPException(status_code=422, detail="No answers submitted")
+        if len(changes) > MAX_ANSWERS_PER_SUBMISSION:
+            raise HTTPException(
+                status_code=422, detail=f"At most {MAX_ANSWERS_PER_SUBMISSION} answers per submission"
+            )
+        index = test_catalog.index(db)
+        cells, errors = DraftService.validate_changes(changes, test_type, index)
+        if errors:
+            raise HTTPException(status_code=422, detail=errors)
+        total = len(index.items.get(test_type, ()))
+        etag = index.etags.get(test_type, "")
+
+        for retry in (False, True):
+            now = datetime.utcnow()
+            draft = DraftService._locked(db, current_user.id, test_type)
+            if draft is None:
+                attempt = TestAttempt(user_id=current_user.id, test_type=test_type, started_at=now)
+                draft = TestDraft(user_id=current_user.id, test_type=test_type, attempt=attempt, levels=b"")
+                db.add(draft)
+            levels = bytearray(draft.levels if draft.catalog_etag == etag else b"")
+            if len(levels) < total:
+                levels.extend(bytes(total - len(levels)))
+            for position, cell in cells:
+                levels[position - 1] = cell
+            draft.levels = bytes(levels)
+            draft.catalog_etag = etag
+            draft.updated_at = now
+            try:
+                db.flush()
+                out = _draft_out(draft, total)
+                db.commit()
+                break
+            except IntegrityError:
+                # A concurrent first save created the draft; apply on top of it
+                db.rollback()
+                if retry:
+                    raise
+        return out
+
+    @staticmethod
+    def get(test_type: str, current_user: User, db: Session) -> Dict[str, Any]:
+        draft = (
+            db.query(TestDraft)
+            .filter(TestDraft.user_id == current_user.id, TestDraft.test_type == test_type)
+            .one_or_none()
+        )
+        if draft is None:
+            raise HTTPException(status_code=404, detail="No draft for this test")
+        index = test_catalog.index(db)
+        _check_current(draft, index)
+        return {
+            **_draft_out(draft, len(index.items.get(test_type, ()))),
+            "startedAt": draft.attempt.started_at.isoformat(),
+            "answers": [
+                {"testId": str(test_id), "optionId": str(option_id)}
+                for test_id, option_id in DraftService.answers(draft, index)
+            ],
+        }
+
+    @staticmethod
+    def finalize(test_type: str, current_user: User, db: Session) -> Dict[str, Any]:
+        """
+        Turn the draft into its finished attempt, answers and score, and
+        drop it, in one transaction.
+        """
+        draft = DraftService._locked(db, current_user.id, test_type)
+        if draft is None:
+            raise HTTPException(status_code=404, detail="No draft for this test")
+        index = test_catalog.index(db)
+        _check_current(draft, index)
+        rows = DraftService.answers(draft, index)
+        if not rows:
+            raise HTTPException(status_code=422, detail="The draft has no answers")
+        attempt = draft.attempt
+        db.delete(draft)
+        results = TestService.finish_attempts(db, current_user.id, rows, index, attempts={test_type: attempt})
+        db.commit()
+        return {
+            "status": "success",
+            "saved": [{"testId": str(test_id), "optionId": str(option_id)} for test_id, option_id in rows],
+            "results": results,
+        }
+
+    @staticmethod
+    def discard(test_type: str, current_user: User, db: Session) -> None:
+        draft = DraftService._locked(db, current_user.id, test_type)
+        if draft is None:
+            raise HTTPException(status_code=404, detail="No draft for this test")
+        attempt = draft.attempt
+        db.delete(draft)
+        db.delete(attempt)
+        db.commit()
@@ -0,0 +1,185 @@
+import csv
+import io
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.auth import password_hash_pool, pwd_context
+from app.models.models import User
+from app.schemas.user import UserCreate
+
+# Optional columns accepted next to email/password
+OPTIONAL_FIELDS = {
+    "username": "username",
+    "displayName": "display_name",
+    "display_name": "display_name",
+    "dob": "dob",
+}
+
+
+def _hash_password(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def hash_in_pool(passwords: List[str]) -> List[str]:
+    """Hash on the server's shared bcrypt pool, under its admission control."""
+    return password_hash_pool.map(_hash_password, passwords)
+
+
+def hash_in_processes(passwords: List[str], workers: Optional[int] = None) -> List[str]:
+    """Hash across a process pool; for the CLI, never inside an API worker."""
+    workers = workers or os.cpu_count() or 1
+    if len(passwords) <= 1 or workers <= 1:
+        return [_hash_password(p) for p in passwords]
+    # spawn: never fork a process that may be running server threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(_hash_password, passwords, chunksize=max(1, len(passwords) // (workers * 4))))
+
+
+class ProvisioningService:
+    @staticmethod
+    def parse_rows(content: str, fmt: str) -> List[Dict[str, Any]]:
+        """
+        Parse a CSV (with header) or NDJSON document into raw row dicts.
+        """
+        fmt = fmt.lower()
+        if fmt == "csv":
+            return [dict(row) for row in csv.DictReader(io.StringIO(content))]
+        if fmt in ("ndjson", "jsonl"):
+            rows = []
+            for line in content.splitlines():
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    rows.append({"_error": "Invalid JSON line"})
+                    continue
+                rows.append(row if isinstance(row, dict) else {"_error": "Expected a JSON object"})
+            return rows
+        raise ValueError(f"Unsupported format: {fmt}")
+
+    @staticmethod
+    def _existing(db: Session, column, values: List[str], chunk: int = 500) -> set:
+        found = set()
+        for i in range(0, len(values), chunk):
+            part = values[i:i + chunk]
+            found.update(v for (v,) in db.query(column).filter(column.in_(part)))
+        return found
+
+    @staticmethod
+    def provision(
+        rows: Iterable[Dict[str, Any]],
+        db: Session,
+        hash_passwords: Callable[[List[str]], List[str]] = hash_in_pool,
+        batch_size: int = 500,
+    ) -> Dict[str, Any]:
+        """
+        Create users in bulk.
+
+        Rows are validated and checked against existing emails/usernames up
+        front. Passwords are hashed with hash_passwords (the shared bcrypt
+        pool by default, a process pool from the CLI) and the users are
+        inserted with one multi-row INSERT per batch. Bad or duplicate rows
+        are reported and never abort the rest of the batch.
+        """
+        started = time.perf_counter()
+        results: List[Dict[str, Any]] = []
+        pending: List[Dict[str, Any]] = []
+        seen_emails, seen_usernames = set(), set()
+
+        for index, raw in enumerate(rows, 1):
+            if "_error" in raw:
+                results.append({"row": index, "email": None, "status": "invalid", "detail": raw["_error"]})
+                continue
+            try:
+                account = UserCreate(email=raw.get("email"), password=raw.get("password"))
+            except ValidationError as e:
+                results.append({
+                    "row": index,
+                    "email": raw.get("email"),
+                    "status": "invalid",
+                    "detail": "; ".join(err["msg"] for err in e.errors()),
+                })
+                continue
+            values = {"email": account.email}
+            bad_fields = [field for field in OPTIONAL_FIELDS if raw.get(field) and not isinstance(raw[field], str)]
+            if bad_fields:
+                results.append({
+                    "row": index,
+                    "email": account.email,
+                    "status": "invalid",
+                    "detail": f"{', '.join(bad_fields)} must be a string",
+                })
+                continue
+            for field, column in OPTIONAL_FIELDS.items():
+                if raw.get(field):
+                    values[column] = raw[field]
+            if account.email in seen_emails or values.get("username") in seen_usernames:
+                results.append({"row": index, "email": account.email, "status": "duplicate", "detail": "Repeated in input"})
+                continue
+            seen_emails.add(account.email)
+            if values.get("username"):
+                seen_usernames.add(values["username"])
+            pending.append({"row": index, "values": values, "password": account.password})
+
+        existing_emails = ProvisioningService._existing(db, User.email, [p["values"]["email"] for p in pending])
+        existing_usernames = ProvisioningService._existing(
+            db, User.username, [p["values"]["username"] for p in pending if p["values"].get("username")]
+        )
+        accepted = []
+        for item in pending:
+            values = item["values"]
+            if values["email"] in existing_emails:
+                results.append({"row": item["row"], "email": values["email"], "status": "duplicate", "detail": "Email already registered"})
+            elif values.get("username") in existing_usernames:
+                results.append({"row": item["row"], "email": values["email"], "status": "duplicate", "detail": "Username already taken"})
+            else:
+                accepted.append(item)
+
+        hashes = hash_passwords([item["password"] for item in accepted])
+        for item, hashed in zip(accepted, hashes):
+            item["values"]["password"] = hashed
+
+        created = 0
+        for i in range(0, len(accepted), batch_size):
+            batch = accepted[i:i + batch_size]
+            try:
+                db.execute(insert(User), [item["values"] for item in batch])
+                db.commit()
+                outcomes = [("created", None)] * len(batch)
+            except IntegrityError:
+                # Lost a race with a concurrent signup: settle the batch row by row
+                db.rollback()
+                outcomes = []
+                for item in batch:
+                    try:
+                        db.execute(insert(User), [item["values"]])
+                        db.commit()
+                        outcomes.append(("created", None))
+                    except IntegrityError:
+                        db.rollback()
+                        outcomes.append(("duplicate", "Email or username already registered"))
+            for item, (status, detail) in zip(batch, outcomes):
+                created += status == "created"
+                results.append({"row": item["row"], "email": item["values"]["email"], "status": status, "detail": detail})
+
+        elapsed = time.perf_counter() - started
+        results.sort(key=lambda r: r["row"])
+        return {
+            "total": len(results),
+            "created": created,
+            "failed": len(results) - created,
+            "elapsed_seconds": round(elapsed, 3),
+            "users_per_second": round(created / elapsed, 1) if elapsed else None,
+            "results": results,
+        }
@@ -1,12 +1,18 @@
-from docx import Document
 import re
 from sqlalchemy.orm import Session
+from app.core.config import BASE_DIR
+from app.core.invalidation import invalidation_bus
 from app.models.models import Test, Entity, Group, TestAnswer, Option
 from typing import List, Dict, Any
 
+QUESTIONS_DIR = BASE_DIR / 'app' / 'data' / 'questions'
+
 class QuestionService:
     @staticmethod
     def read_questions_from_docx(file_path: str) -> List[Dict[str, Any]]:
+        # python-docx is only needed by the import scripts; keep it off the app's import path
+        from docx import Document
+
         doc = Document(file_path)
         questions = []
         print(f"Đang đọc file: {file_path}")
@@ -103,6 +109,7 @@ class QuestionService:
                     option = Option(test_id=test.id, content=opt['content'], level=opt['level'])
                     db.add(option)
             db.commit()
+            invalidation_bus.publish("catalog", group_name)
         except Exception as e:
             db.rollback()
             print(f"Lỗi khi import vào database: {str(e)}")
@@ -112,9 +119,9 @@ class QuestionService:
     def import_all_questions(db: Session) -> None:
         # Đường dẫn tới các file câu hỏi và tên nhóm tương ứng
         file_paths = {
-            'DASS': 'app/data/questions/TRẮC-NGHIỆM-LO-ÂU-TRẦM-CẢM.-STRESS-DASS.docx',
-            'RADS': 'app/data/questions/TRẮC-NGHIỆM-ĐÁNH-GIÁ-TRẦM-CẢM-THANH-THIẾU-NIÊN-RADS.docx',
-            'MDQ': 'app/data/questions/TRẮC-NGHIỆM-SÀNG-LỌC-RỐI-LOẠN-CẢM-XÚC-LƯỠNG-CỰC.docx'
+            'DASS': str(QUESTIONS_DIR / 'TRẮC-NGHIỆM-LO-ÂU-TRẦM-CẢM.-STRESS-DASS.docx'),
+            'RADS': str(QUESTIONS_DIR / 'TRẮC-NGHIỆM-ĐÁNH-GIÁ-TRẦM-CẢM-THANH-THIẾU-NIÊN-RADS.docx'),
+            'MDQ': str(QUESTIONS_DIR / 'TRẮC-NGHIỆM-SÀNG-LỌC-RỐI-LOẠN-CẢM-XÚC-LƯỠNG-CỰC.docx')
         }
         
         for test_type, file_path in file_paths.items():
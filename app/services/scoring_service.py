@@ -0,0 +1,137 @@
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from app.services.catalog_service import CatalogIndex
+
+# Item scores: options are stored with levels 1-4 (0/1 for the MDQ yes/no
+# items); the score sheets count 0-3
+DASS_BANDS = {
+    # subscale: upper bounds of normal, mild, moderate, severe; above is extremely severe
+    "D": (9, 13, 20, 27),
+    "A": (7, 9, 14, 19),
+    "S": (14, 18, 25, 33),
+}
+DASS_BAND_NAMES = ("normal", "mild", "moderate", "severe", "extremely_severe")
+
+# Positively worded RADS items, scored 3-2-1-0
+RADS_REVERSED = frozenset({1, 5, 10, 12, 23, 25, 29})
+RADS_BANDS = (30, 40, 50)
+RADS_BAND_NAMES = ("normal", "mild", "moderate", "severe")
+
+# MDQ: items 1-13 are part 1 (yes = 1), item 14 is part 2 (co-occurrence),
+# item 15 is part 3 (impairment, levels 1-4)
+MDQ_PART1_ITEMS = 13
+MDQ_PART1_THRESHOLD = 7
+MDQ_PART3_THRESHOLD = 3
+
+SCALES = {"DASS": tuple(DASS_BANDS), "RADS": ("total",), "MDQ": ("part1", "part2", "part3")}
+
+
+class OptionScore(NamedTuple):
+    test_type: str
+    scale: str
+    points: int
+
+
+class ScoreResult(NamedTuple):
+    test_type: str
+    scores: Dict[str, int]
+    bands: Dict[str, str]
+    answered: int
+    complete: bool
+
+
+def _band(value: int, bounds: Tuple[int, ...], names: Tuple[str, ...]) -> str:
+    for bound, name in zip(bounds, names):
+        if value <= bound:
+            return name
+    return names[-1]
+
+
+def _option_score(info, level: int) -> Optional[OptionScore]:
+    if info.test_type == "DASS":
+        if info.code not in DASS_BANDS:
+            return None
+        return OptionScore("DASS", info.code, level - 1)
+    if info.test_type == "RADS":
+        return OptionScore("RADS", "total", 4 - level if info.position in RADS_REVERSED else level - 1)
+    if info.test_type == "MDQ":
+        if info.position <= MDQ_PART1_ITEMS:
+            return OptionScore("MDQ", "part1", level)
+        return OptionScore("MDQ", "part2" if info.position == MDQ_PART1_ITEMS + 1 else "part3", level)
+    return None
+
+
+def build_tables(index: CatalogIndex) -> Tuple[Dict[int, OptionScore], Counter]:
+    """
+    Option id -> (test type, subscale, item score), precomputed once per
+    catalog, and the number of items per test type.
+    """
+    tables = {}
+    for test_id, options in index.options.items():
+        info = index.tests[test_id]
+        for option_id, level in options.items():
+            score = _option_score(info, level)
+            if score is not None:
+                tables[option_id] = score
+    return tables, Counter(info.test_type for info in index.tests.values())
+
+
+def _bands(test_type: str, scores: Dict[str, int]) -> Dict[str, str]:
+    if test_type == "DASS":
+        return {scale: _band(scores.get(scale, 0), bounds, DASS_BAND_NAMES) for scale, bounds in DASS_BANDS.items()}
+    if test_type == "RADS":
+        return {"total": _band(scores.get("total", 0), RADS_BANDS, RADS_BAND_NAMES)}
+    positive = (
+        scores.get("part1", 0) >= MDQ_PART1_THRESHOLD
+        and scores.get("part2", 0) == 1
+        and scores.get("part3", 0) >= MDQ_PART3_THRESHOLD
+    )
+    return {"screen": "positive" if positive else "negative"}
+
+
+class ScoringService:
+    # (catalog index, tables, item counts), swapped as one so readers never
+    # pair an index with another index's tables
+    _cached: Tuple[Optional[CatalogIndex], Dict[int, OptionScore], Counter] = (None, {}, Counter())
+    _lock = threading.Lock()
+
+    @staticmethod
+    def tables(index: CatalogIndex) -> Tuple[Dict[int, OptionScore], Counter]:
+        # Rebuilt whenever the catalog hands out a new index (content import)
+        cached = ScoringService._cached
+        if cached[0] is not index:
+            with ScoringService._lock:
+                cached = ScoringService._cached
+                if cached[0] is not index:
+                    cached = (index, *build_tables(index))
+                    ScoringService._cached = cached
+        return cached[1], cached[2]
+
+    @staticmethod
+    def score(option_ids: Iterable[int], index: CatalogIndex) -> List[ScoreResult]:
+        """
+        Subscale totals and severity bands for a submission, one result per
+        test type it contains: a single pass of table lookups and sums.
+        """
+        tables, item_counts = ScoringService.tables(index)
+        totals: Dict[str, Counter] = {}
+        answered: Counter = Counter()
+        for option_id in option_ids:
+            entry = tables.get(option_id)
+            if entry is None:
+                continue
+            totals.setdefault(entry.test_type, Counter())[entry.scale] += entry.points
+            answered[entry.test_type] += 1
+        results = []
+        for test_type, scale_totals in totals.items():
+            scores = {scale: scale_totals.get(scale, 0) for scale in SCALES[test_type]}
+            results.append(ScoreResult(
+                test_type,
+                scores,
+                _bands(test_type, scores),
+                answered[test_type],
+                answered[test_type] >= item_counts[test_type],
+            ))
+        return results
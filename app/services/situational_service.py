@@ -1,8 +1,10 @@
 import os
 import re
+import threading
 
 from fastapi import Depends, Query
-from app.core.auth import get_current_user
+from app.core.auth import get_current_user, invalidate_principal
+from app.core.invalidation import invalidation_bus
 from app.core.database import get_db
 from app.models.models import (
     SituationalQuestion,
@@ -12,8 +14,8 @@ from app.models.models import (
     SituationGroup,
 )
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-from docx import Document
+from typing import Any, Dict, List, Optional, Tuple
+from app.services.star_service import StarService, SITUATIONAL
 
 
 class SituationalService:
@@ -26,6 +28,9 @@ class SituationalService:
         - Mặc định Level = 1 cho tới khi gặp dòng "Level X" thì chuyển level hiện hành.
         - Mỗi câu hỏi bắt đầu bằng "Tình huống" và kết thúc trước tiêu đề "Tình huống" tiếp theo hoặc "Level".
         """
+        # python-docx is only needed by the import scripts; keep it off the app's import path
+        from docx import Document
+
         data = []
         # Đường dẫn mặc định tới thư mục chứa file situational
         directory = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'data', 'situation')
@@ -232,6 +237,8 @@ class SituationalService:
             db.flush()
             print("Đã thêm câu hỏi:", situ_question.content)
         db.commit()
+        for group_id in situation_groups:
+            invalidation_bus.publish("situational", str(group_id))
 
     @staticmethod
     def get_progress(group: int, db: Session, current_user: User):
@@ -274,7 +281,11 @@ class SituationalService:
         return result
 
     @staticmethod
-    def get_situational_questions(group: int, level: int, db: Session, current_user: User):
+    def get_situational_questions(group: int, level: int, db: Session, current_user: Optional[User]):
+        return situational_cache.get(group, level, db)
+
+    @staticmethod
+    def build_situational_questions(group: int, level: int, db: Session) -> List[Dict[str, Any]]:
         questions = (
             db.query(SituationalQuestion)
             .filter(
@@ -324,16 +335,17 @@ class SituationalService:
             if situ_answer and situ_answer.is_correct:
                 stars_earned += 1
         # Cộng sao cho user
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            user.stars = (user.stars or 0) + stars_earned
-            db.commit()
-            db.refresh(user)
-            return user.stars
-        return 0
+        stars = StarService.award(db, user_id, stars_earned, SITUATIONAL)
+        db.commit()
+        if stars is None:
+            return 0
+        if stars_earned:
+            invalidate_principal(db.query(User.email).filter(User.id == user_id).scalar())
+        return stars
 
     @staticmethod
-    def submit_situational_answers(answers: list, user_id: int, db: Session):
+    def submit_situational_answers(answers: list, current_user: User, db: Session):
+        user_id = current_user.id
         correct_count = 0
         for ans in answers:
             # Lưu đáp án của user
@@ -348,11 +360,54 @@ class SituationalService:
             if situ_answer and situ_answer.is_correct:
                 correct_count += 1
         # Cộng sao cho user
-        user = db.query(User).filter(User.id == user_id).first()
-        if user:
-            user.stars = (user.stars or 0) + correct_count
-            db.commit()
-            db.refresh(user)
-            return {"stars": user.stars}
+        stars = StarService.award(db, user_id, correct_count, SITUATIONAL)
         db.commit()
-        return {"stars": 0}
+        if stars is None:
+            return {"stars": 0}
+        if correct_count:
+            invalidate_principal(current_user.email)
+        return {"stars": stars}
+
+
+class SituationalCache:
+    """
+    GET /situational payloads per (group, level); they are the same for
+    every user. The import publishes the groups it changed on the
+    "situational" invalidation namespace and their levels are rebuilt on
+    the next request. Empty results are not kept, so unknown ids cannot
+    grow the cache.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[int, int], List[Dict[str, Any]]] = {}
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+
+    def get(self, group: int, level: int, db: Session) -> List[Dict[str, Any]]:
+        entry = self._entries.get((group, level))
+        if entry is not None:
+            self.hits += 1
+            return entry
+        generation = self._generations.get(group, 0)
+        entry = SituationalService.build_situational_questions(group, level, db)
+        self.builds += 1
+        with self._lock:
+            # An import that finished while we were reading wins; rebuild next time
+            if entry and generation == self._generations.get(group, 0):
+                self._entries[(group, level)] = entry
+        return entry
+
+    def invalidate(self, key: str) -> None:
+        group = int(key)
+        with self._lock:
+            self._generations[group] = self._generations.get(group, 0) + 1
+            self._entries = {k: v for k, v in self._entries.items() if k[0] != group}
+
+    def stats(self) -> Dict[str, Any]:
+        return {"entries": len(self._entries), "hits": self.hits, "builds": self.builds}
+
+
+situational_cache = SituationalCache()
+invalidation_bus.subscribe("situational", situational_cache.invalidate)
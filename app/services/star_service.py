@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import DateTime, delete, func, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.bootstrap import advisory_lock
+from app.core.config import settings
+from app.core.maintenance import periodic
+from app.models.models import StarLedger, User
+
+# Ledger sources
+ATTENDANCE = "attendance"
+SITUATIONAL = "situational"
+OPENING = "opening"
+
+
+class StarService:
+    @staticmethod
+    def award(db: Session, user_id: int, amount: int, source: str) -> Optional[int]:
+        """
+        Add stars with one atomic UPDATE and log the award in star_ledger.
+
+        Returns the new balance, or None when the user does not exist. The
+        caller commits, so the balance and its ledger entry land together.
+        """
+        if amount == 0:
+            return db.execute(select(func.coalesce(User.stars, 0)).where(User.id == user_id)).scalar()
+        stmt = (
+            update(User)
+            .where(User.id == user_id)
+            .values(stars=func.coalesce(User.stars, 0) + amount)
+            .execution_options(synchronize_session=False)
+        )
+        if db.get_bind().dialect.update_returning:
+            balance = db.execute(stmt.returning(User.stars)).scalar()
+        elif db.execute(stmt).rowcount:
+            balance = db.execute(select(User.stars).where(User.id == user_id)).scalar()
+        else:
+            balance = None
+        if balance is None:
+            return None
+        db.execute(insert(StarLedger).values(user_id=user_id, source=source, amount=amount, created_at=datetime.utcnow()))
+        return balance
+
+    @staticmethod
+    def compact(db: Session, retention_days: Optional[int] = None) -> int:
+        """
+        Fold ledger entries older than the retention window into one entry per
+        user and source, in two set-based statements and one transaction.
+        Sums (and so users.stars) are unchanged. Returns the number of rows
+        removed. Runs in the background every
+        STAR_LEDGER_COMPACT_INTERVAL_SECONDS (see compact_star_ledger).
+        """
+        days = settings.STAR_LEDGER_RETENTION_DAYS if retention_days is None else retention_days
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        max_id = db.execute(select(func.max(StarLedger.id)).where(StarLedger.created_at < cutoff)).scalar()
+        if max_id is None:
+            return 0
+        # The folded rows get ids above max_id, so the DELETE leaves them alone
+        old = (StarLedger.id <= max_id, StarLedger.created_at < cutoff)
+        folded = db.execute(
+            insert(StarLedger).from_select(
+                ["user_id", "source", "amount", "created_at"],
+                select(StarLedger.user_id, StarLedger.source, func.sum(StarLedger.amount), literal(cutoff, DateTime))
+                .where(*old)
+                .group_by(StarLedger.user_id, StarLedger.source),
+            )
+        ).rowcount
+        deleted = db.execute(delete(StarLedger).where(*old)).rowcount
+        db.commit()
+        return deleted - folded
+
+    @staticmethod
+    def ledger_balance(db: Session, user_id: int) -> int:
+        return db.query(func.coalesce(func.sum(StarLedger.amount), 0)).filter(StarLedger.user_id == user_id).scalar()
+
+
+@periodic("star_ledger_compaction", settings.STAR_LEDGER_COMPACT_INTERVAL_SECONDS)
+def compact_star_ledger(db: Session) -> None:
+    # Every worker schedules the job; concurrent folds would double-count
+    with advisory_lock(db.get_bind(), settings.STAR_LEDGER_COMPACT_LOCK_ID, blocking=False) as taken:
+        if taken:
+            StarService.compact(db)
@@ -1,9 +1,19 @@
+import base64
+import json
+from datetime import datetime
+
 from fastapi import HTTPException
+from sqlalchemy import and_, insert, or_
 from sqlalchemy.orm import Session
-from app.models.models import Test, Entity, TestAnswer, User, Option, Group
-from typing import List, Dict, Any, Literal
+from app.models.models import Test, Entity, TestAnswer, TestAttempt, TestResult, User, Option, Group
+from app.services.catalog_service import CatalogIndex, OptionIndex, test_catalog
+from app.services.scoring_service import ScoringService
+from typing import List, Dict, Any, Literal, Optional, Tuple
 from pydantic import BaseModel
 
+# A full catalog is under 100 tests
+MAX_ANSWERS_PER_SUBMISSION = 100
+
 class OptionOut(BaseModel):
     id: str
     content: str
@@ -49,19 +59,178 @@ class TestService:
             )
         return [GroupedTestOut(group=type, test=test_list)]
 
+    @staticmethod
+    def validate_answers(answers: List[TestAnswerIn], options: OptionIndex) -> Tuple[List[Tuple[int, int]], List[Dict[str, Any]]]:
+        """
+        Check a whole batch against the catalog's option index. Returns the
+        (test_id, option_id) pairs and the per-item errors.
+        """
+        rows = []
+        errors = []
+        seen = set()
+        for index, ans in enumerate(answers):
+            try:
+                test_id, option_id = int(ans.testId), int(ans.optionId)
+            except ValueError:
+                errors.append({"index": index, "msg": "testId and optionId must be integers"})
+                continue
+            valid = options.get(test_id)
+            if valid is None:
+                errors.append({"index": index, "msg": f"Unknown test {test_id}"})
+            elif option_id not in valid:
+                errors.append({"index": index, "msg": f"Option {option_id} does not belong to test {test_id}"})
+            elif test_id in seen:
+                errors.append({"index": index, "msg": f"Test {test_id} answered more than once"})
+            else:
+                seen.add(test_id)
+                rows.append((test_id, option_id))
+        return rows, errors
+
     @staticmethod
     def submit_test_answers(answers: List[TestAnswerIn], current_user: User, db: Session) -> Dict[str, Any]:
-        saved_answers = []
-        for ans in answers:
-            answer = TestAnswer(
-                user_id=current_user.id,
-                test_id=int(ans.testId),
-                option_id=ans.optionId
+        """
+        Validate the batch up front, then store it with one multi-row INSERT.
+        Nothing is written unless every answer is valid.
+        """
+        if not answers:
+            raise HTTPException(status_code=422, detail="No answers submitted")
+        if len(answers) > MAX_ANSWERS_PER_SUBMISSION:
+            raise HTTPException(
+                status_code=422, detail=f"At most {MAX_ANSWERS_PER_SUBMISSION} answers per submission"
             )
-            db.add(answer)
-            saved_answers.append({
-                "testId": ans.testId,
-                "optionId": ans.optionId
-            })
+        index = test_catalog.index(db)
+        rows, errors = TestService.validate_answers(answers, index.options)
+        if errors:
+            raise HTTPException(status_code=422, detail=errors)
+        results = TestService.finish_attempts(db, current_user.id, rows, index)
         db.commit()
-        return {"status": "success", "saved": saved_answers} 
\ No newline at end of file
+        return {
+            "status": "success",
+            "saved": [{"testId": ans.testId, "optionId": ans.optionId} for ans in answers],
+            "results": results,
+        }
+
+    @staticmethod
+    def finish_attempts(
+        db: Session,
+        user_id: int,
+        rows: List[Tuple[int, int]],
+        index: CatalogIndex,
+        attempts: Optional[Dict[str, TestAttempt]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Record validated (test_id, option_id) rows as finished attempts, one
+        per test type: the attempt, its answers (one multi-row INSERT) and
+        its scored test_result. Attempts already started can be passed in
+        by type. The caller commits.
+        """
+        now = datetime.utcnow()
+        attempts = dict(attempts or {})
+        for test_id, _ in rows:
+            test_type = index.tests[test_id].test_type
+            if test_type not in attempts:
+                attempts[test_type] = TestAttempt(user_id=user_id, test_type=test_type, started_at=now)
+                db.add(attempts[test_type])
+        for attempt in attempts.values():
+            attempt.finished_at = now
+        db.flush()
+
+        db.execute(
+            insert(TestAnswer).values([
+                {
+                    "user_id": user_id,
+                    "attempt_id": attempts[index.tests[test_id].test_type].id,
+                    "test_id": test_id,
+                    "option_id": option_id,
+                }
+                for test_id, option_id in rows
+            ])
+        )
+        # Scores are materialized with the answers; result screens read one row
+        results = ScoringService.score((option_id for _, option_id in rows), index)
+        if results:
+            db.execute(
+                insert(TestResult).values([
+                    {
+                        "user_id": user_id,
+                        "attempt_id": attempts[result.test_type].id,
+                        "test_type": result.test_type,
+                        "scores": json.dumps(result.scores, separators=(",", ":")),
+                        "bands": json.dumps(result.bands, separators=(",", ":")),
+                        "answered": result.answered,
+                        "complete": result.complete,
+                        "created_at": now,
+                    }
+                    for result in results
+                ])
+            )
+        return [
+            {
+                "attemptId": attempts[result.test_type].id,
+                "type": result.test_type,
+                "scores": result.scores,
+                "bands": result.bands,
+                "answered": result.answered,
+                "complete": result.complete,
+            }
+            for result in results
+        ]
+
+    @staticmethod
+    def get_history(user_id: int, test_type: str, limit: int, cursor: Optional[str], db: Session) -> Dict[str, Any]:
+        """
+        A user's finished attempts of one type, newest first. Keyset
+        pagination on (finished_at, id) walks ix_test_attempt_user_type_finished,
+        so a page costs O(limit) however many attempts and answers exist.
+        """
+        query = (
+            db.query(TestAttempt, TestResult)
+            .join(TestResult, TestResult.attempt_id == TestAttempt.id)
+            .filter(
+                TestAttempt.user_id == user_id,
+                TestAttempt.test_type == test_type,
+                TestAttempt.finished_at.isnot(None),
+            )
+        )
+        if cursor:
+            finished_at, attempt_id = _decode_cursor(cursor)
+            query = query.filter(or_(
+                TestAttempt.finished_at < finished_at,
+                and_(TestAttempt.finished_at == finished_at, TestAttempt.id < attempt_id),
+            ))
+        rows = (
+            query.order_by(TestAttempt.finished_at.desc(), TestAttempt.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+        items = [
+            {
+                "attemptId": attempt.id,
+                "type": attempt.test_type,
+                "startedAt": attempt.started_at.isoformat(),
+                "finishedAt": attempt.finished_at.isoformat(),
+                "scores": json.loads(result.scores),
+                "bands": json.loads(result.bands),
+                "answered": result.answered,
+                "complete": result.complete,
+            }
+            for attempt, result in rows[:limit]
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1][0]
+            next_cursor = _encode_cursor(last.finished_at, last.id)
+        return {"items": items, "nextCursor": next_cursor}
+
+
+def _encode_cursor(finished_at: datetime, attempt_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{finished_at.isoformat()}|{attempt_id}".encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        finished_at, attempt_id = raw.split("|")
+        return datetime.fromisoformat(finished_at), int(attempt_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
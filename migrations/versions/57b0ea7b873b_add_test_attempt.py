@@ -0,0 +1,56 @@
+"""add test_attempt
+
+Revision ID: 57b0ea7b873b
+Revises: d83b6f0a2e47
+Create Date: 2026-10-18 21:14:07.993996
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '57b0ea7b873b'
+down_revision: Union[str, None] = 'd83b6f0a2e47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('test_attempt',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('test_type', sa.String(length=8), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('finished_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_test_attempt_user_type_finished', 'test_attempt', ['user_id', 'test_type', 'finished_at', 'id'], unique=False)
+    with op.batch_alter_table('test_answer') as batch_op:
+        batch_op.add_column(sa.Column('attempt_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_test_answer_attempt_id'), ['attempt_id'], unique=False)
+        batch_op.create_foreign_key(
+            batch_op.f('fk_test_answer_attempt_id_test_attempt'), 'test_attempt', ['attempt_id'], ['id'], ondelete='CASCADE'
+        )
+    with op.batch_alter_table('test_result') as batch_op:
+        batch_op.add_column(sa.Column('attempt_id', sa.Integer(), nullable=True))
+        batch_op.create_unique_constraint(batch_op.f('uq_test_result_attempt_id'), ['attempt_id'])
+        batch_op.create_foreign_key(
+            batch_op.f('fk_test_result_attempt_id_test_attempt'), 'test_attempt', ['attempt_id'], ['id'], ondelete='CASCADE'
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('test_result') as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_test_result_attempt_id_test_attempt'), type_='foreignkey')
+        batch_op.drop_constraint(batch_op.f('uq_test_result_attempt_id'), type_='unique')
+        batch_op.drop_column('attempt_id')
+    with op.batch_alter_table('test_answer') as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_test_answer_attempt_id_test_attempt'), type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_test_answer_attempt_id'))
+        batch_op.drop_column('attempt_id')
+    op.drop_index('ix_test_attempt_user_type_finished', table_name='test_attempt')
+    op.drop_table('test_attempt')
@@ -0,0 +1,43 @@
+"""add star_ledger
+
+Revision ID: 5e8a41c2d7b9
+Revises: 747be3a9eb74
+Create Date: 2026-10-18 18:05:41.263817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e8a41c2d7b9'
+down_revision: Union[str, None] = '747be3a9eb74'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('star_ledger',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('source', sa.String(length=32), nullable=False),
+    sa.Column('amount', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_star_ledger_created_at'), 'star_ledger', ['created_at'], unique=False)
+    op.create_index(op.f('ix_star_ledger_user_id'), 'star_ledger', ['user_id'], unique=False)
+    # Existing balances become opening entries so the ledger sums to users.stars
+    op.execute(
+        "INSERT INTO star_ledger (user_id, source, amount, created_at) "
+        "SELECT id, 'opening', stars, CURRENT_TIMESTAMP FROM users WHERE stars > 0"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_star_ledger_user_id'), table_name='star_ledger')
+    op.drop_index(op.f('ix_star_ledger_created_at'), table_name='star_ledger')
+    op.drop_table('star_ledger')
@@ -0,0 +1,38 @@
+"""add test_draft
+
+Revision ID: b4e19f7c2d08
+Revises: 57b0ea7b873b
+Create Date: 2026-10-18 22:03:41.508213
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4e19f7c2d08'
+down_revision: Union[str, None] = '57b0ea7b873b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('test_draft',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('test_type', sa.String(length=8), nullable=False),
+    sa.Column('attempt_id', sa.Integer(), nullable=False),
+    sa.Column('levels', sa.LargeBinary(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['attempt_id'], ['test_attempt.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('attempt_id'),
+    sa.UniqueConstraint('user_id', 'test_type', name='uq_test_draft_user_type')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('test_draft')
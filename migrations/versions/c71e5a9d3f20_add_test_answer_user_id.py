@@ -0,0 +1,34 @@
+"""add test_answer.user_id
+
+Revision ID: c71e5a9d3f20
+Revises: 9a4f2c6e1b3d
+Create Date: 2026-10-18 20:03:52.690114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c71e5a9d3f20'
+down_revision: Union[str, None] = '9a4f2c6e1b3d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('test_answer') as batch_op:
+        batch_op.add_column(sa.Column('user_id', sa.Integer(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_test_answer_user_id'), ['user_id'], unique=False)
+        batch_op.create_foreign_key(
+            batch_op.f('fk_test_answer_user_id_users'), 'users', ['user_id'], ['id'], ondelete='CASCADE'
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('test_answer') as batch_op:
+        batch_op.drop_constraint(batch_op.f('fk_test_answer_user_id_users'), type_='foreignkey')
+        batch_op.drop_index(batch_op.f('ix_test_answer_user_id'))
+        batch_op.drop_column('user_id')
@@ -0,0 +1,29 @@
+"""add test_draft catalog_etag
+
+Revision ID: c81d5e3a9f47
+Revises: e2a7c4b91f56
+Create Date: 2026-10-19 11:02:47.318904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c81d5e3a9f47'
+down_revision: Union[str, None] = 'e2a7c4b91f56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing drafts get an empty version, which never matches: they are treated as stale
+    with op.batch_alter_table('test_draft') as batch_op:
+        batch_op.add_column(sa.Column('catalog_etag', sa.String(length=34), server_default='', nullable=False))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('test_draft') as batch_op:
+        batch_op.drop_column('catalog_etag')
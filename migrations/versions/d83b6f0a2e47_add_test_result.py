@@ -0,0 +1,39 @@
+"""add test_result
+
+Revision ID: d83b6f0a2e47
+Revises: c71e5a9d3f20
+Create Date: 2026-10-18 20:41:16.305529
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd83b6f0a2e47'
+down_revision: Union[str, None] = 'c71e5a9d3f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('test_result',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('test_type', sa.String(length=8), nullable=False),
+    sa.Column('scores', sa.String(), nullable=False),
+    sa.Column('bands', sa.String(), nullable=False),
+    sa.Column('answered', sa.Integer(), nullable=False),
+    sa.Column('complete', sa.Boolean(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_test_result_user_type_created', 'test_result', ['user_id', 'test_type', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_test_result_user_type_created', table_name='test_result')
+    op.drop_table('test_result')